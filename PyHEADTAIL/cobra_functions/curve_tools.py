@@ -7,7 +7,7 @@ from scipy.optimize import brentq
 def zero_crossings(f, x):
     """Get root of function f in intervall x"""
     y = f(x)
-    zix = np.where(np.abs(np.diff(np.sign(y))) == 2)[0]
+    zix = np.where(y[:-1]*y[1:] < 0)[0]
 
     x0 = np.array([brentq(f, x[i], x[i+1]) for i in zix])
     # y0 = np.array([f(i) for i in x0])
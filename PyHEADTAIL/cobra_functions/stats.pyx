@@ -4,6 +4,11 @@
 @brief Collection of cython functions to calculate statistics
        of bunch and slice_set data.
 @copyright CERN
+
+The bunch coordinate arguments accept float64 and float32 arrays
+(fused types floating1, floating2, floating3, independent of each
+other such that the coordinates passed to one call may differ in
+precision), the sums are always accumulated in double precision.
 """
 
 import numpy as np
@@ -14,11 +19,22 @@ cimport cython.boundscheck
 cimport cython.cdivision
 cimport cython.wraparound
 
+ctypedef fused floating1:
+    float
+    double
+
+ctypedef fused floating2:
+    float
+    double
+
+ctypedef fused floating3:
+    float
+    double
 
 
 @cython.boundscheck(False)
 @cython.cdivision(True)
-cpdef double cov(double[::1] a, double[::1] b):
+cpdef double cov(floating1[::1] a, floating2[::1] b):
     """ Cython function which calculates the covariance
     (not the covariance matrix!) of two data sets
     a and b using a shifted single pass algorithm
@@ -50,7 +66,7 @@ cpdef double cov(double[::1] a, double[::1] b):
 
 @cython.boundscheck(False)
 @cython.cdivision(True)
-cpdef double std(double[::1] u):
+cpdef double std(floating1[::1] u):
     """ Cython function to calculate the standard deviation of
     dataset u. The dataset must consist of at least 2 samples
     """
@@ -58,15 +74,15 @@ cpdef double std(double[::1] u):
 
 @cython.boundscheck(False)
 @cython.cdivision(True)
-cpdef double dispersion(double[::1] u, double[::1] dp):
+cpdef double dispersion(floating1[::1] u, floating2[::1] dp):
     """Cython function to compute the statistial dispersion:
     disp = <u*dp>/<dp**2>
     Args:
         u a coordinate array, typically x or y spatial coordinates
           it is also possible to pass xp or yp
     """
-    cdef double mean_u_dp = np.mean(np.multiply(u, dp))
-    cdef double mean_dp2 = np.mean(np.multiply(dp, dp))
+    cdef double mean_u_dp = np.mean(np.multiply(u, dp), dtype=np.float64)
+    cdef double mean_dp2 = np.mean(np.multiply(dp, dp), dtype=np.float64)
     if mean_dp2 > 0: # can never be smaller than 0
         return mean_u_dp / mean_dp2
     else:
@@ -85,7 +101,8 @@ cdef double _det_beam_matrix(double sigma11, double sigma12, double sigma22):
 
 @cython.boundscheck(False)
 @cython.cdivision(True)
-cpdef double emittance(double[::1] u, double[::1] up, double[::1] dp):
+cpdef double emittance(floating1[::1] u, floating2[::1] up,
+                        floating3[::1] dp):
     """ Cython function to calculate the effective (neglecting dispersion)
     emittance of datasets u and up, i.e. a coordinate-momentum pair.
     To calculate the emittance, one needs the mean values of quantities u and
@@ -96,24 +113,23 @@ cpdef double emittance(double[::1] u, double[::1] up, double[::1] dp):
         dp momentum deviation array: (p-p_0)/p_0. If None, the effective
            emittance is computed instead (dispersion is set to 0)
     """
-    covariance = cov
     cdef double sigma11 = 0.
     cdef double sigma12 = 0.
     cdef double sigma22 = 0.
-    cdef double cov_u2 = covariance(u, u)
-    cdef double cov_up2 = covariance(up, up)
-    cdef double cov_u_up = covariance(up, u)
+    cdef double cov_u2 = cov(u, u)
+    cdef double cov_up2 = cov(up, up)
+    cdef double cov_u_up = cov(up, u)
 
     cdef double term_u2_dp = 0.
     cdef double term_u_up_dp = 0.
     cdef double term_up2_dp = 0.
 
     if dp != None: #if not None, assign values to variables involving dp
-        cov_dp2 = covariance(dp, dp)
+        cov_dp2 = cov(dp, dp)
 
         if cov_dp2 != 0:
-            cov_u_dp = covariance(u, dp)
-            cov_up_dp = covariance(up, dp)
+            cov_u_dp = cov(u, dp)
+            cov_up_dp = cov(up, dp)
 
             term_u2_dp = cov_u_dp * cov_u_dp / cov_dp2
             term_u_up_dp = cov_u_dp * cov_up_dp / cov_dp2
@@ -127,7 +143,8 @@ cpdef double emittance(double[::1] u, double[::1] up, double[::1] dp):
 
 @cython.boundscheck(False)
 @cython.cdivision(True)
-cpdef double get_alpha(double[::1] u, double[::1] up, double[::1] dp):
+cpdef double get_alpha(floating1[::1] u, floating2[::1] up,
+                        floating3[::1] dp):
     """Cython function to calculate the statistical alpha (Twiss)
     If dp=None, the effective alpha is computed
     Args:
@@ -135,21 +152,21 @@ cpdef double get_alpha(double[::1] u, double[::1] up, double[::1] dp):
         up: momentum coordinate array
         dp: (p-p0)/p0
     """
-    covariance = cov
-    cdef double cov_u_up = covariance(u, up)
+    cdef double cov_u_up = cov(u, up)
     cdef double cov_dp2 = 1.
     cdef double cov_u_dp = 0.
     cdef double cov_up_dp = 0.
     if dp != None:
-        cov_dp2 = covariance(dp, dp)
-        cov_u_dp = covariance(u, dp)
-        cov_up_dp = covariance(up, dp)
+        cov_dp2 = cov(dp, dp)
+        cov_u_dp = cov(u, dp)
+        cov_up_dp = cov(up, dp)
     cdef double sigma12 = cov_u_up - cov_u_dp * cov_up_dp / cov_dp2
     return - sigma12 / emittance(u, up, dp)
 
 @cython.boundscheck(False)
 @cython.cdivision(True)
-cpdef double get_beta(double[::1] u, double[::1] up, double[::1] dp):
+cpdef double get_beta(floating1[::1] u, floating2[::1] up,
+                       floating3[::1] dp):
     """Cython function to calculate the statistical beta (Twiss)
     If dp=None, the effective beta is computed
     Args:
@@ -157,19 +174,19 @@ cpdef double get_beta(double[::1] u, double[::1] up, double[::1] dp):
         up: momentum coordinate array
         dp: (p-p0)/p0
     """
-    covariance = cov
-    cdef double cov_u2 = covariance(u, u)
+    cdef double cov_u2 = cov(u, u)
     cdef double cov_u_dp = 0.
     cdef double cov_dp2 = 1. # default initialization to 1 -> division if dp=0
     if dp != None:
-        cov_u_dp = covariance(u, dp)
-        cov_dp2 = covariance(dp, dp)
+        cov_u_dp = cov(u, dp)
+        cov_dp2 = cov(dp, dp)
     cdef double sigma11 = cov_u2 - cov_u_dp * cov_u_dp / cov_dp2
     return sigma11 / emittance(u, up, dp)
 
 @cython.boundscheck(False)
 @cython.cdivision(True)
-cpdef double get_gamma(double[::1] u, double[::1] up, double[::1] dp):
+cpdef double get_gamma(floating1[::1] u, floating2[::1] up,
+                        floating3[::1] dp):
     """Cython function to calculate the statistical gamma (Twiss)
     If dp=None, the effective gamma is computed
     Args:
@@ -177,13 +194,12 @@ cpdef double get_gamma(double[::1] u, double[::1] up, double[::1] dp):
         up: momentum coordinate array
         dp: (p-p0)/p0
     """
-    covariance = cov
-    cdef double cov_up2 = covariance(up, up)
+    cdef double cov_up2 = cov(up, up)
     cdef double cov_up_dp = 0.
     cdef double cov_dp2 = 1.
     if dp != None:
-        cov_up_dp = covariance(up, dp)
-        cov_dp2 = covariance(dp, dp)
+        cov_up_dp = cov(up, dp)
+        cov_dp2 = cov(dp, dp)
     cdef double sigma22 = cov_up2 - cov_up_dp * cov_up_dp / cov_dp2
     return sigma22 / emittance(u, up, dp)
 
@@ -239,7 +255,7 @@ cpdef sort_particle_indices_by_slice(int[::1] slice_index_of_particle,
 cpdef mean_per_slice(int[::1] slice_index_of_particle,
                      int[::1] particles_within_cuts,
                      int[::1] n_macroparticles,
-                     double[::1] u, double[::1] mean_u):
+                     floating1[::1] u, double[::1] mean_u):
     """ Iterate once through all the particles within the
     slicing region and calculate simultaneously the mean
     value of quantity u for each slice separately. """
@@ -262,7 +278,7 @@ cpdef mean_per_slice(int[::1] slice_index_of_particle,
 cpdef std_per_slice(int[::1] slice_index_of_particle,
                     int[::1] particles_within_cuts,
                     int[::1] n_macroparticles,
-                    double[::1] u, double[::1] std_u):
+                    floating1[::1] u, double[::1] std_u):
     """ Iterate once through all the particles within the
     slicing region and calculate simultaneously the
     standard deviation of quantity u for each slice
@@ -294,7 +310,8 @@ cpdef std_per_slice(int[::1] slice_index_of_particle,
 cpdef cov_per_slice(int[::1] slice_index_of_particle,
                     int[::1] particles_within_cuts,
                     int[::1] n_macroparticles,
-                    double[::1] a, double[::1] b, double[::1] result):
+                    floating1[::1] a, floating2[::1] b,
+                    double[::1] result):
     """Cov per slice. Cannot make use of cov() because the particles
     per slice are not contiguous in memory"""
     #TODO: write single pass version of this algorithm
@@ -378,8 +395,8 @@ cpdef emittance_per_slice_old(int[::1] slice_index_of_particle,
 cpdef emittance_per_slice(int[::1] slice_index_of_particle,
                           int[::1] particles_within_cuts,
                           int[::1] n_macroparticles,
-                          double[::1] u, double[::1] up, double[::1] dp,
-                          double[::1] emittance):
+                          floating1[::1] u, floating2[::1] up,
+                          floating3[::1] dp, double[::1] emittance):
     """ Iterate once through all the particles within the
     slicing region and calculate simultaneously the emittance
     of quantities u and up, i.e. a coordinate-momentum pair,
@@ -145,6 +145,15 @@ def _emittance_per_slice_cpu(sliceset, u, up, dp=None, **kwargs):
                            u, up, dp, emittance_u)
     return emittance_u
 
+def _mean_cpu(a, *args, **kwargs):
+    '''np.mean accumulating in (at least) double precision, such that
+    the statistics of float32 coordinate arrays do not suffer from
+    single precision round-off.
+    '''
+    kwargs.setdefault('dtype', np.promote_types(np.asarray(a).dtype,
+                                                np.float64))
+    return np.mean(a, *args, **kwargs)
+
 def _count_macroparticles_per_slice_cpu(sliceset):
     output = np.zeros(sliceset.n_slices, dtype=np.int32)
     cp.count_macroparticles_per_slice(sliceset.slice_index_of_particle,
@@ -200,7 +209,7 @@ _CPU_numpy_func_dict = {
     'exp': np.exp,
     'log': np.log,
     'arcsin': np.arcsin,
-    'mean': np.mean,
+    'mean': _mean_cpu,
     'std': cp.std,
     'emittance': lambda *args, **kwargs: cp.emittance(*args, **kwargs),
     'min': np.min,
@@ -315,6 +315,123 @@ if has_pycuda:
                             slice_array, sliceset.n_slices, particle_array)
         return particle_array
 
+    def _check_fused_dtypes(*arrays):
+        '''The fused tracking kernels are compiled for double precision
+        coordinate arrays only.
+        '''
+        if any(a.dtype != np.float64 for a in arrays):
+            raise TypeError('fused tracking on the GPU currently only ' +
+                            'supports np.float64 coordinate arrays.')
+
+    _fused_linear_turn = pycuda.elementwise.ElementwiseKernel(
+        arguments='double* x, double* xp, double* y, double* yp, '
+                  'double* z, double* dp, '
+                  'const double M00, const double M01, const double M10, '
+                  'const double M11, const double M22, const double M23, '
+                  'const double M32, const double M33, '
+                  'const double D_x_s0, const double D_x_s1, '
+                  'const double D_y_s0, const double D_y_s1, '
+                  'const double cosdQ_s, const double sindQ_s, '
+                  'const double longfac, const double D_x, const double D_y',
+        operation='const double dp0 = dp[i];'
+                  'const double x0 = x[i] - D_x_s0 * dp0;'
+                  'const double y0 = y[i] - D_y_s0 * dp0;'
+                  'const double xp0 = xp[i];'
+                  'const double yp0 = yp[i];'
+                  'const double x1 = M00 * x0 + M01 * xp0 + (D_x_s1 - D_x) * dp0;'
+                  'const double y1 = M22 * y0 + M23 * yp0 + (D_y_s1 - D_y) * dp0;'
+                  'xp[i] = M10 * x0 + M11 * xp0;'
+                  'yp[i] = M32 * y0 + M33 * yp0;'
+                  'const double z0 = z[i];'
+                  'const double dp1 = dp0 * cosdQ_s + z0 / longfac * sindQ_s;'
+                  'z[i] = z0 * cosdQ_s - longfac * dp0 * sindQ_s;'
+                  'dp[i] = dp1;'
+                  'x[i] = x1 + D_x * dp1;'
+                  'y[i] = y1 + D_y * dp1',
+        name='_fused_linear_turn'
+    )
+    def fused_linear_turn(x, xp, y, yp, z, dp, *coefficients, **kwargs):
+        '''GPU version of trackers.fused.track_turn, tracks the
+        particle coordinates in place. The coefficients are the scalar
+        arguments of track_turn (in the same order).
+        '''
+        _check_fused_dtypes(x, xp, y, yp, z, dp)
+        _fused_linear_turn(x, xp, y, yp, z, dp,
+                           *[np.float64(c) for c in coefficients],
+                           stream=kwargs.get('stream', None))
+
+    _fused_rf_turn = pycuda.elementwise.ElementwiseKernel(
+        arguments='double* x, double* xp, double* y, double* yp, '
+                  'double* z, double* dp, '
+                  'const double M00, const double M01, const double M10, '
+                  'const double M11, const double M22, const double M23, '
+                  'const double M32, const double M33, '
+                  'const double D_x_s0, const double D_x_s1, '
+                  'const double D_y_s0, const double D_y_s1, '
+                  'const double* eta_0, const int n_eta_0, '
+                  'const double length_0, const double beta_ratio_1, '
+                  'const double* eta_1, const int n_eta_1, '
+                  'const double length_1, '
+                  'const double* amplitudes, const double* wavenumbers, '
+                  'const double* phases, const double* p_increments, '
+                  'const double* p0_before, const double* p0_after, '
+                  'const double* D_x, const double* D_y, const int n_kicks',
+        operation='double dpi = dp[i];'
+                  'const double x0 = x[i] - D_x_s0 * dpi;'
+                  'const double y0 = y[i] - D_y_s0 * dpi;'
+                  'const double xp0 = xp[i];'
+                  'const double yp0 = yp[i];'
+                  'double xi = M00 * x0 + M01 * xp0 + D_x_s1 * dpi;'
+                  'double yi = M22 * y0 + M23 * yp0 + D_y_s1 * dpi;'
+                  'xp[i] = M10 * x0 + M11 * xp0;'
+                  'yp[i] = M32 * y0 + M33 * yp0;'
+                  'double eta = 0.;'
+                  'for (int j = n_eta_0 - 1; j >= 0; j--) {'
+                      'eta = eta * dpi + eta_0[j];'
+                  '}'
+                  'double zi = z[i] - eta * dpi * length_0;'
+                  'for (int k = 0; k < n_kicks; k++) {'
+                      'xi -= D_x[k] * dpi;'
+                      'yi -= D_y[k] * dpi;'
+                      'double delta_p = dpi * p0_before[k];'
+                      'delta_p += amplitudes[k] * sin(wavenumbers[k] * zi'
+                                 ' + phases[k]) - p_increments[k];'
+                      'dpi = delta_p / p0_after[k];'
+                      'xi += D_x[k] * dpi;'
+                      'yi += D_y[k] * dpi;'
+                  '}'
+                  'eta = 0.;'
+                  'for (int j = n_eta_1 - 1; j >= 0; j--) {'
+                      'eta = eta * dpi + eta_1[j];'
+                  '}'
+                  'z[i] = beta_ratio_1 * zi - eta * dpi * length_1;'
+                  'dp[i] = dpi;'
+                  'x[i] = xi;'
+                  'y[i] = yi',
+        name='_fused_rf_turn'
+    )
+    def fused_rf_turn(x, xp, y, yp, z, dp, M, D_segment,
+                      eta_0, length_0, beta_ratio_1, eta_1, length_1,
+                      amplitudes, wavenumbers, phases, p_increments,
+                      p0_before, p0_after, D_x, D_y, stream=None):
+        '''GPU version of trackers.fused.track_turn_rf, tracks the
+        particle coordinates in place. M and D_segment are the tuples
+        of transfer matrix elements and dispersion parameters of the
+        transverse segment, the remaining arguments are those of
+        track_turn_rf. The parameter arrays (eta_0, eta_1 and the per
+        kick arrays) need to be GPUArrays of np.float64 already.
+        '''
+        _check_fused_dtypes(x, xp, y, yp, z, dp)
+        _fused_rf_turn(x, xp, y, yp, z, dp,
+                       *[np.float64(c) for c in tuple(M) + tuple(D_segment)],
+                       eta_0, np.int32(eta_0.size),
+                       np.float64(length_0), np.float64(beta_ratio_1),
+                       eta_1, np.int32(eta_1.size),
+                       np.float64(length_1),
+                       amplitudes, wavenumbers, phases, p_increments,
+                       p0_before, p0_after, D_x, D_y,
+                       np.int32(amplitudes.size), stream=stream)
+
 
 def _inplace_pow(x_gpu, p, stream=None):
     '''
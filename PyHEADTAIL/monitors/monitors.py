@@ -383,20 +383,26 @@ class SliceMonitor(Monitor):
 class ParticleMonitor(Monitor):
     """Class to store particle-specific data to a HDF5 file, i.e. the
     coordinates and conjugate momenta as well as the id of individual
-    macroparticles of a bunch. """
+    macroparticles of a bunch. This monitor can use a buffer to reduce
+    the number of writing operations to file. """
 
     def __init__(self, filename, stride=1, parameters_dict=None,
-                 *args, **kwargs):
+                 write_buffer_every=1, *args, **kwargs):
         """ Create an instance of a ParticleMonitor class. The HDF5 file
         is initialized, and if specified, the parameters_dict is written
         to file.
 
-          filename:        Path and name of HDF5 file. Without file
-                           extension.
-          stride:          Only store data of macroparticles for which
-                           id % stride == 0.
-          parameters_dict: Metadata for HDF5 file containing main
-                           simulation parameters.
+          filename:           Path and name of HDF5 file. Without file
+                              extension.
+          stride:             Only store data of macroparticles for
+                              which id % stride == 0.
+          parameters_dict:    Metadata for HDF5 file containing main
+                              simulation parameters.
+          write_buffer_every: Number of steps after which buffer
+                              contents are actually written to file.
+                              For values > 1, call self.flush() after
+                              the last dump to write the remaining
+                              buffered steps to file.
 
           Optionally pass a list called quantities_to_store which
           specifies which members of the bunch will be called/stored.
@@ -408,13 +414,25 @@ class ParticleMonitor(Monitor):
         self.stride = stride
         self.i_steps = 0
 
+        # Prepare buffer.
+        self.write_buffer_every = write_buffer_every
+        self.buffer_steps = []
+
         self._create_file_structure(parameters_dict)
 
     def dump(self, bunch, arrays_dict=None):
-        """ Write particle data to file. See docstring of method
-        self._write_data_to_file . """
-        self._write_data_to_file(bunch, arrays_dict)
+        """ Write particle data to the buffer and, every
+        self.write_buffer_every steps, the buffer contents to file.
+        See docstring of method self._write_data_to_buffer . """
+        self._write_data_to_buffer(bunch, arrays_dict)
         self.i_steps += 1
+        if len(self.buffer_steps) >= self.write_buffer_every:
+            self._write_buffer_to_file()
+
+    def flush(self):
+        """ Write all steps remaining in the buffer to file. """
+        if self.buffer_steps:
+            self._write_buffer_to_file()
 
     def _create_file_structure(self, parameters_dict):
         """ Initialize HDF5 file. If specified by the user, write the
@@ -431,21 +449,12 @@ class ParticleMonitor(Monitor):
             self.warns(err.message)
             raise
 
-    def _write_data_to_file(self, bunch, arrays_dict):
-        """ Write macroparticle data (x, xp, y, yp, z, dp, id) of a
-        selection of particles to the HDF5 file. Optionally, data in
-        additional_quantities can also be added if provided in the
-        constructor. The file is opened and closed every time to prevent
-        from loss of data in case of a crash.
-        For each simulation step, a new group with name 'Step#..' is
-        created. It contains one dataset for each of the quantities
-        given in self.quantities_to_store. """
-        h5file = hp.File(self.filename + '.h5part', 'a')
-        h5group = h5file.create_group('Step#' + str(self.i_steps))
-        dims = (bunch.macroparticlenumber // self.stride,)
-        dims = list(bunch.get_coords_n_momenta_dict().values())[0][::self.stride].shape # more robust implementation
-
-        # resorting_indices = np.argsort(bunch.id)[::self.stride]
+    def _write_data_to_buffer(self, bunch, arrays_dict):
+        """ Store macroparticle data (x, xp, y, yp, z, dp, id) of a
+        selection of particles in the buffer self.buffer_steps .
+        Optionally, data in arrays_dict can also be added. The data
+        are copied as the bunch arrays may be modified in place by
+        the subsequent tracking. """
         all_quantities = {}
         for quant in self.quantities_to_store:
             quant_values = getattr(bunch, quant)
@@ -461,12 +470,27 @@ class ParticleMonitor(Monitor):
             all_quantities.update(arrays_dict)
 
         for quant in list(all_quantities.keys()):
-            quant_values = all_quantities[quant]
-            h5group.create_dataset(quant, shape=dims, compression='gzip',
-                compression_opts=9, dtype=quant_values.dtype)
-            h5group[quant][:] = quant_values[::self.stride]
+            all_quantities[quant] = np.array(
+                all_quantities[quant][::self.stride])
+
+        self.buffer_steps.append((self.i_steps, all_quantities))
 
+    def _write_buffer_to_file(self):
+        """ Write the buffered steps to the HDF5 file. The file is
+        opened and closed every time the buffer is written to prevent
+        from loss of data in case of a crash.
+        For each simulation step, a new group with name 'Step#..' is
+        created. It contains one dataset for each of the quantities
+        given in self.quantities_to_store. """
+        h5file = hp.File(self.filename + '.h5part', 'a')
+        for i_step, all_quantities in self.buffer_steps:
+            h5group = h5file.create_group('Step#' + str(i_step))
+            for quant in list(all_quantities.keys()):
+                quant_values = all_quantities[quant]
+                h5group.create_dataset(quant, data=quant_values,
+                    compression='gzip', compression_opts=9)
         h5file.close()
+        self.buffer_steps = []
 
 
 class CellMonitor(Monitor):
@@ -26,6 +26,7 @@ def generate_Gaussian6DTwiss(
         epsn_x, epsn_y, epsn_z,
         dispersion_x=None, dispersion_y=None,
         limit_n_rms_x=None, limit_n_rms_y=None, limit_n_rms_z=None,
+        dtype=np.float64,
         ):
     """ Convenience wrapper generating a 6D Gaussian phase space
     distribution of macro-particles with the specified parameters:
@@ -54,6 +55,10 @@ def generate_Gaussian6DTwiss(
         limit_n_rms_z: longitudinal number of RMS amplitudes to cut
             distribution (remember that epsn_z is already 4x the RMS
             value, i.e. 2 amplitudes)
+        dtype: floating point type of the coordinate and momentum
+            arrays, e.g. np.float32 to halve the memory traffic of
+            the tracking (statistics are still accumulated in double
+            precision)
 
     Return a Particles instance with the phase space matched to the
     arguments.
@@ -99,7 +104,7 @@ def generate_Gaussian6DTwiss(
         macroparticlenumber, intensity, charge, mass, circumference, gamma,
         distribution_x, alpha_x, beta_x, dispersion_x,
         distribution_y, alpha_y, beta_y, dispersion_y,
-        distribution_z, Qs, eta
+        distribution_z, Qs, eta, dtype=dtype
         ).generate()
 
 
@@ -306,7 +311,7 @@ class ParticleGenerator(Printing):
                  distribution_x=None, alpha_x=0., beta_x=1., D_x=None,
                  distribution_y=None, alpha_y=0., beta_y=1., D_y=None,
                  distribution_z=None, Qs=None, eta=None,
-                 *args, **kwargs):
+                 *args, dtype=np.float64, **kwargs):
         '''
         Specify the distribution for each phase space seperately. Only
         the phase spaces for which a distribution has been specified
@@ -331,6 +336,9 @@ class ParticleGenerator(Printing):
                 longitudinal phase space gets matched to these parameters.
             eta: Slippage factor (zeroth order).If Qs and eta are specified
                 the longitudinal phase space gets matched to these parameters.
+            dtype: floating point type of the generated coordinate and
+                momentum arrays. The phase space is generated and matched
+                in double precision and cast to dtype afterwards.
         '''
         self.macroparticlenumber = macroparticlenumber
         self.intensity = intensity
@@ -338,6 +346,7 @@ class ParticleGenerator(Printing):
         self.mass = mass
         self.circumference = circumference
         self.gamma = gamma
+        self.dtype = dtype
         # bind the generator methods and parameters for the matching
         self.distribution_x = distribution_x
         self.distribution_y = distribution_y
@@ -363,6 +372,7 @@ class ParticleGenerator(Printing):
                               self.gamma,
                               coords_n_momenta_dict=coords)
         self._linear_match_phase_space(particles)
+        self._cast_phase_space(particles, coords)
         return particles
 
     def update(self, beam):
@@ -373,6 +383,7 @@ class ParticleGenerator(Printing):
         coords = self._create_phase_space()
         beam.update(coords)
         self._linear_match_phase_space(beam)
+        self._cast_phase_space(beam, coords)
 
     def _create_phase_space(self):
         coords = {}
@@ -404,6 +415,11 @@ class ParticleGenerator(Printing):
         if self.distribution_y is not None:
             self.linear_matcher_y(beam, ['y', 'yp'])
 
+    def _cast_phase_space(self, beam, coords):
+        for coord in coords:
+            setattr(beam, coord, np.ascontiguousarray(
+                getattr(beam, coord), dtype=self.dtype))
+
 
 def import_distribution2D(coords):
     '''Return a closure which generates the phase space specified
@@ -75,6 +75,28 @@ class TestParticleGenerators(unittest.TestCase):
                 msg='Updating the beam with new coordinates invalidates' +
                 'existing coordinates')
 
+    def test_single_precision_coordinates(self):
+        '''Tests whether dtype=np.float32 produces single precision
+        coordinates whose statistics agree with the double precision beam
+        '''
+        beams = []
+        for dtype in [np.float64, np.float32]:
+            np.random.seed(0)
+            beams.append(gf.ParticleGenerator(
+                self.nparticles, self.intensity,
+                self.charge, self.mass, self.circumference, self.gamma,
+                distribution_x=gf.gaussian2D(0.5), alpha_x=-0.7, beta_x=4,
+                distribution_z=gf.gaussian2D(3.0), dtype=dtype,
+                printer=SilentPrinter()).generate())
+        beam64, beam32 = beams
+        for coord in ['x', 'xp', 'z', 'dp']:
+            self.assertEqual(getattr(beam32, coord).dtype, np.float32,
+                             'coordinates not generated in single precision')
+        for stat in ['sigma_x', 'epsn_x', 'sigma_dp', 'epsn_z']:
+            self.assertAlmostEqual(
+                getattr(beam32, stat)() / getattr(beam64, stat)(), 1,
+                places=5, msg=stat + ' of the single precision beam deviates')
+
     def test_distributions(self):
         '''Tests whether the specified distributions return the coords
         in the correct format (dimensions). If new distributions are added,
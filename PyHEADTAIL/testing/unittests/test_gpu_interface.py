@@ -39,6 +39,13 @@ from PyHEADTAIL.rfq.rfq import RFQLongitudinalKick, RFQTransverseKick
 from PyHEADTAIL.rfq.rfq import RFQTransverseDetuner
 import PyHEADTAIL.general.decorators as decorators
 
+try:
+    from PyHEADTAIL.trackers.fused import FusedLinearMap, FusedRFSystems
+except ImportError:
+    has_numba = False
+else:
+    has_numba = True
+
 try:
     import PyCERNmachines.CERNmachines as m
     # for replacing the cython versions in machines
@@ -209,6 +216,62 @@ class TestGPUInterface(unittest.TestCase):
         self.assertTrue(self._track_cpu_gpu([longitudinal_map], bunch_cpu,
             bunch_gpu), 'Longitudinal tracking RFSystems CPU/GPU differs')
 
+    @unittest.skipUnless(has_numba, 'numba not found')
+    def test_fused_linear_map(self):
+        '''
+        Track through a FusedLinearMap and compare the CPU (numba
+        track_turn) and GPU versions
+        '''
+        bunch_cpu = self.create_gaussian_bunch()
+        bunch_gpu = self.create_gaussian_bunch()
+        transverse_map = tt.TransverseMap(self.s, self.alpha_x, self.beta_x,
+            self.Dx, self.alpha_y, self.beta_y, self.Dy, self.Qx, self.Qy,
+            printer=SilentPrinter())
+        linear_map = lt.LinearMap([0.05], self.circumference, self.Q_s,
+            D_x=self.Dx[0], D_y=self.Dy[0])
+        fused_map = FusedLinearMap(transverse_map[-1], linear_map)
+        self.assertTrue(self._track_cpu_gpu([fused_map], bunch_gpu,
+            bunch_cpu, nturns=3), 'FusedLinearMap CPU/GPU differs')
+
+    @unittest.skipUnless(has_numba, 'numba not found')
+    def test_fused_rf_systems(self):
+        '''
+        Track through a FusedRFSystems and compare the CPU (numba
+        track_turn_rf) and GPU versions
+        '''
+        bunch_cpu = self.create_gaussian_bunch()
+        bunch_gpu = self.create_gaussian_bunch()
+        bunch_cpu.dp *= 1e-3
+        bunch_gpu.dp *= 1e-3
+        transverse_map = tt.TransverseMap(self.s, self.alpha_x, self.beta_x,
+            self.Dx, self.alpha_y, self.beta_y, self.Dy, self.Qx, self.Qy,
+            printer=SilentPrinter())
+        rf_systems = lt.RFSystems(
+                self.circumference, [self.h1, self.h2], [self.V1, self.V2],
+                [self.dphi1, self.dphi2], [0.05, 0.01], self.gamma, 0,
+                D_x=self.Dx[0], D_y=self.Dy[0], charge=e, mass=m_p
+            )
+        fused_map = FusedRFSystems(transverse_map[-1], rf_systems)
+        self.assertTrue(self._track_cpu_gpu([fused_map], bunch_gpu,
+            bunch_cpu, nturns=3), 'FusedRFSystems CPU/GPU differs')
+
+    @unittest.skipUnless(has_numba, 'numba not found')
+    def test_fused_single_precision_raises(self):
+        '''
+        The GPU fused tracking kernels only support float64 coordinates
+        '''
+        bunch = self.create_gaussian_bunch()
+        for coord in bunch.coords_n_momenta:
+            setattr(bunch, coord, getattr(bunch, coord).astype(np.float32))
+        transverse_map = tt.TransverseMap(self.s, self.alpha_x, self.beta_x,
+            self.Dx, self.alpha_y, self.beta_y, self.Dy, self.Qx, self.Qy,
+            printer=SilentPrinter())
+        linear_map = lt.LinearMap([0.05], self.circumference, self.Q_s)
+        fused_map = FusedLinearMap(transverse_map[-1], linear_map)
+        with GPU(bunch) as device:
+            with self.assertRaises(TypeError):
+                fused_map.track(bunch)
+
     @unittest.skipUnless(has_PyCERNmachines, 'No PyCERNmachines.')
     def test_wakefield_platesresonator(self):
         '''
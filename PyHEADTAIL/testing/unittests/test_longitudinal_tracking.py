@@ -5,6 +5,7 @@
 
 
 import unittest
+import warnings
 import numpy as np
 from scipy.constants import c, e, m_p
 
@@ -12,6 +13,9 @@ from PyHEADTAIL.particles.particles import Particles
 from PyHEADTAIL.trackers.longitudinal_tracking import (
     Drift, Kick, LongitudinalOneTurnMap, RFSystems, LinearMap
     )
+from PyHEADTAIL.trackers import rf_bucket
+from PyHEADTAIL.cobra_functions.curve_tools import (
+    zero_crossings as cvt_zero_crossings)
 from PyHEADTAIL.general.printers import AccumulatorPrinter
 
 
@@ -125,6 +129,235 @@ class TestSimpleLongTracking(unittest.TestCase):
                        warningprinter=AccumulatorPrinter(),
                        printer=AccumulatorPrinter())
 
+    def test_rfbucket_area(self):
+        '''Tests whether the single particle emittance along the
+        separatrix of a stationary single harmonic RFBucket agrees
+        with the analytical bucket area.
+        '''
+        circumference = 6911.5
+        harmonic = 4620
+        voltage = 4.5e6
+        gamma = 27.7
+        alpha_array = [1.9e-3]
+        rf = RFSystems(circumference, [harmonic], [voltage], [0],
+                       alpha_array, gamma, charge=e, mass=m_p,
+                       printer=AccumulatorPrinter())
+        bucket = rf.get_bucket(gamma=gamma)
+        beta = np.sqrt(1 - gamma**-2)
+        p0 = np.sqrt(gamma**2 - 1) * m_p * c
+        R = circumference / (2 * np.pi)
+        dp_max = np.sqrt(2 * e * voltage / (np.pi * harmonic *
+                         np.abs(bucket.eta0) * beta * c * p0))
+        area = 8 * R * dp_max * p0 / (harmonic * e)
+        self.assertAlmostEqual(bucket.emittance_single_particle() / area,
+                               1, places=5,
+                               msg='RFBucket area deviates from the ' +
+                               'analytical value for a stationary bucket')
+
+    def test_rfbucket_potential_lut(self):
+        '''Tests whether the interpolated potential energy of
+        RFBucket.total_potential_fast agrees with the exact
+        total_potential, inside and outside the tabulated interval.
+        '''
+        circumference = 6911.5
+        gamma = 27.7
+        rf = RFSystems(circumference, [4620, 9240], [4.5e6, 1e6],
+                       [0, np.pi], [1.9e-3], gamma, p_increment=5e-22,
+                       charge=e, mass=m_p, printer=AccumulatorPrinter())
+        bucket = rf.get_bucket(gamma=gamma)
+        z = np.linspace(1.2*bucket.interval[0], 1.2*bucket.interval[1], 1001)
+        v_max = np.amax(np.abs(bucket.total_potential(z)))
+        self.assertTrue(np.allclose(bucket.total_potential_fast(z),
+                                    bucket.total_potential(z),
+                                    rtol=0, atol=1e-5*v_max),
+                        'interpolated potential deviates from ' +
+                        'RFBucket.total_potential')
+        z_in = bucket.z_sfp_extr
+        dp = np.linspace(0, 1.5*bucket.dp_max(bucket.z_ufp_separatrix), 100)
+        is_in = bucket.is_in_separatrix(z_in, dp)
+        self.assertTrue(np.any(is_in) and not np.all(is_in),
+                        'dp samples do not cross the separatrix')
+        self.assertTrue(np.array_equal(
+            is_in, bucket.is_in_separatrix(z_in, dp, use_lut=True)),
+            'is_in_separatrix differs when using the lookup table')
+
+    def test_rfbucket_parameter_setters(self):
+        '''Tests whether changing the RF parameters of an RFBucket
+        via the list setters invalidates the cached bucket shape.
+        '''
+        def make_bucket(voltages):
+            rf = RFSystems(6911.5, [4620, 9240], voltages, [0, np.pi],
+                           [1.9e-3], 27.7, p_increment=5e-22, charge=e,
+                           mass=m_p, printer=AccumulatorPrinter())
+            return rf.get_bucket(gamma=27.7)
+        bucket = make_bucket([4.5e6, 1e6])
+        # fill the caches
+        bucket.separatrix(0.)
+        bucket.is_in_separatrix(0., 0.)
+        bucket.total_potential_fast(0.)
+        bucket.voltage_list = [6e6, 1e6]
+        reference = make_bucket([6e6, 1e6])
+        self.assertAlmostEqual(
+            bucket.hamiltonian(bucket.z_ufp_separatrix, 0) /
+            reference.hamiltonian(reference.z_sfp_extr, 0), 0, places=10,
+            msg='separatrix Hamiltonian not zero after setting voltages')
+        for attr in ['z_left', 'z_right', 'Q_s']:
+            self.assertAlmostEqual(getattr(bucket, attr) /
+                                   getattr(reference, attr), 1, places=10,
+                                   msg=attr + ' not updated by the setter')
+        z = np.linspace(reference.z_left, reference.z_right, 11)
+        self.assertTrue(np.allclose(bucket.separatrix(z),
+                                    reference.separatrix(z)),
+                        'separatrix not updated by the setter')
+        self.assertTrue(np.allclose(bucket.total_potential_fast(z),
+                                    reference.total_potential_fast(z)),
+                        'potential lookup table not updated by the setter')
+
+    def test_rfbucket_machine_setters(self):
+        '''Tests whether changing alpha0 or p_increment of an RFBucket
+        updates the derived quantities and the cached bucket shape,
+        and whether the circumference is read-only.
+        '''
+        def make_bucket(alpha0, p_increment):
+            return rf_bucket.RFBucket(
+                6911.5, 27.7, m_p, e, [alpha0], p_increment, [4620, 9240],
+                [4.5e6, 1e6], [0, np.pi])
+        bucket = make_bucket(1.9e-3, 0)
+        # fill the caches
+        bucket.separatrix(0.)
+        bucket.z_ufp_separatrix
+        bucket.Q_s
+        bucket.p_increment = 5e-22
+        bucket.alpha0 = 2.1e-3
+        reference = make_bucket(2.1e-3, 5e-22)
+        for attr in ['deltaE', 'eta0', 'z_left', 'z_right',
+                     'z_ufp_separatrix', 'Q_s', 'beta_z']:
+            self.assertAlmostEqual(getattr(bucket, attr) /
+                                   getattr(reference, attr), 1, places=10,
+                                   msg=attr + ' not updated by the setters')
+        z = np.linspace(reference.z_left, reference.z_right, 11)
+        self.assertTrue(np.allclose(bucket.separatrix(z),
+                                    reference.separatrix(z)),
+                        'separatrix not updated by the setters')
+        with self.assertRaises(AttributeError):
+            bucket.circumference = 100.
+
+    def test_rfbucket_vanishing_hV(self):
+        '''Tests whether an RFBucket with vanishing sum of harmonics
+        times voltages (for which the linear synchrotron tune is not
+        defined) can be instantiated without numerical warnings.
+        '''
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            bucket = rf_bucket.RFBucket(
+                6911.5, 27.7, m_p, e, [1.9e-3], 0, [4620, 9240],
+                [2e6, -1e6], [0, 0])
+            self.assertTrue(np.isfinite(bucket.guess_H0(0.3)),
+                            'guess_H0 fails for vanishing h*V')
+
+    def test_rfbucket_python_fix_points(self):
+        '''Tests whether the pure Python fix point and boundary search
+        (sharing the harmonics' sin and cos on the sampling grid) agrees
+        with the compiled root finder, also after add_fields.
+        '''
+        def make_bucket():
+            rf = RFSystems(6911.5, [4620, 9240], [4.5e6, 1e6], [0, np.pi],
+                           [1.9e-3], 27.7, p_increment=5e-22, charge=e,
+                           mass=m_p, printer=AccumulatorPrinter())
+            return rf.get_bucket(gamma=27.7)
+        compiled = make_bucket()
+        attrs = ['z_sfp', 'z_ufp', 'z_left', 'z_right']
+        reference = [getattr(compiled, attr) for attr in attrs]
+
+        def check(bucket):
+            for attr, value in zip(attrs, reference):
+                self.assertTrue(np.allclose(getattr(bucket, attr), value,
+                                            rtol=0, atol=1e-10),
+                                attr + ' deviates from the compiled ' +
+                                'root finding')
+            self.assertTrue(hasattr(bucket, '_trig_cache'),
+                            'sampling grid sin and cos not shared')
+
+        flag = rf_bucket.has_bucket_fast
+        try:
+            rf_bucket.has_bucket_fast = False
+            python = make_bucket()
+            check(python)
+            # vanishing additional fields leave the bucket unchanged but
+            # enforce the Python root finding for the compiled bucket, too
+            for bucket in [python, compiled]:
+                bucket.add_fields([lambda z: 0*z], [lambda z: 0*z])
+                check(bucket)
+        finally:
+            rf_bucket.has_bucket_fast = flag
+
+    @unittest.skipUnless(rf_bucket.has_bucket_fast,
+                         'rf_bucket Cython extension not built')
+    def test_rfbucket_cython_roots(self):
+        '''Tests whether the root finding of the Cython extension
+        _bucket_fast agrees with curve_tools.zero_crossings .
+        '''
+        self.check_rf_root_finder(rf_bucket._bucket_fast)
+
+    @unittest.skipUnless(rf_bucket.has_bucket_fast,
+                         'rf_bucket Cython extension not built')
+    def test_rfbucket_scalar_fields(self):
+        '''Tests whether the compiled scalar evaluation of the RFBucket
+        force field and potential energy agrees with the array
+        evaluation.
+        '''
+        circumference = 6911.5
+        gamma = 27.7
+        rf = RFSystems(circumference, [4620, 9240], [4.5e6, 1e6],
+                       [0, np.pi], [1.9e-3], gamma, p_increment=5e-22,
+                       charge=e, mass=m_p, printer=AccumulatorPrinter())
+        bucket = rf.get_bucket(gamma=gamma)
+        z = np.linspace(bucket.z_left, bucket.z_right, 7)
+        for kwargs in [{}, {'acceleration': False}]:
+            f = bucket.total_force(z, **kwargs)
+            f_scalar = [bucket.total_force(float(zi), **kwargs) for zi in z]
+            self.assertTrue(np.allclose(f_scalar, f, rtol=1e-12,
+                                        atol=1e-12*np.amax(np.abs(f))),
+                            'scalar total_force deviates')
+        for kwargs in [{}, {'offset': False}, {'acceleration': False},
+                       {'make_convex': True}]:
+            v = bucket.total_potential(z, **kwargs)
+            v_scalar = [bucket.total_potential(float(zi), **kwargs)
+                        for zi in z]
+            self.assertTrue(np.allclose(v_scalar, v, rtol=1e-12,
+                                        atol=1e-12*np.amax(np.abs(v))),
+                            'scalar total_potential deviates')
+
+    def check_rf_root_finder(self, root_finder):
+        '''Compare the roots of the force field and the potential
+        energy of an accelerating multi-harmonic bucket found by
+        root_finder.find_all_roots with curve_tools.zero_crossings .
+        '''
+        circumference = 6911.5
+        gamma = 27.7
+        rf = RFSystems(circumference, [4620, 9240], [4.5e6, 1e6],
+                       [0, np.pi], [1.9e-3], gamma, p_increment=5e-22,
+                       charge=e, mass=m_p, printer=AccumulatorPrinter())
+        bucket = rf.get_bucket(gamma=gamma)
+        # span several buckets to obtain several roots of each field
+        x = np.linspace(3*bucket.interval[0], 3*bucket.interval[1], 3000)
+        args = (x, bucket.h_arr, bucket.V_arr, bucket.dphi_arr, bucket.R,
+                e / circumference, bucket.deltaE / circumference)
+        v_offset = bucket.total_potential(bucket.z_ufp_separatrix,
+                                          offset=False)
+        for kind, kwargs, field in [
+                (root_finder.FORCE, {}, bucket.total_force),
+                (root_finder.POTENTIAL, {'v_offset': v_offset},
+                 bucket.total_potential)]:
+            roots = root_finder.find_all_roots(kind, *args, **kwargs)
+            roots_python = cvt_zero_crossings(field, x)
+            self.assertTrue(len(roots) > 1, 'no roots found')
+            self.assertEqual(len(roots), len(roots_python),
+                             'different number of roots found')
+            self.assertTrue(np.allclose(roots, roots_python,
+                                        rtol=0, atol=1e-10),
+                            'roots deviate from zero_crossings')
+
     def create_all1_bunch(self):
         x = np.ones(self.macroparticlenumber)
         y = x.copy()
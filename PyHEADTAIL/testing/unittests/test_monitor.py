@@ -12,7 +12,7 @@ from scipy.constants import c, e, m_p
 
 from PyHEADTAIL.particles.particles import Particles
 from PyHEADTAIL.monitors.monitors import (
-    BunchMonitor, SliceMonitor, CellMonitor)
+    BunchMonitor, SliceMonitor, CellMonitor, ParticleMonitor)
 
 class TestMonitor(unittest.TestCase):
     ''' Test the BunchMonitor/SliceMonitor'''
@@ -20,6 +20,7 @@ class TestMonitor(unittest.TestCase):
         self.n_turns = 10
         self.bunch_fn = 'bunchm'
         self.s_fn = 'sm'
+        self.p_fn = 'pm'
         self.nslices = 5
         self.bunch_monitor = BunchMonitor(filename=self.bunch_fn,
                              n_steps=self.n_turns,
@@ -27,12 +28,12 @@ class TestMonitor(unittest.TestCase):
                              stats_to_store=['mean_x', 'macrop'])
 
     def tearDown(self):
-        try:
-            os.remove(self.bunch_fn + '.h5')
-            os.remove(self.s_fn + '.h5')
-            pass
-        except:
-            pass
+        for fn in [self.bunch_fn + '.h5', self.s_fn + '.h5',
+                   self.p_fn + '.h5part']:
+            try:
+                os.remove(fn)
+            except:
+                pass
 
     def test_bunchmonitor(self):
         '''
@@ -92,6 +93,29 @@ class TestMonitor(unittest.TestCase):
 
         # to be extended
 
+    def test_particlemonitor(self):
+        '''
+        Test whether the buffered particlemonitor stores the particle
+        data of every step, including the steps remaining in the
+        buffer at the end.
+        '''
+        bunch = self.generate_real_bunch()
+        particle_monitor = ParticleMonitor(filename=self.p_fn, stride=3,
+                                           write_buffer_every=4)
+        x_dumped = []
+        for i in range(self.n_turns):
+            bunch.x += 1
+            particle_monitor.dump(bunch)
+            x_dumped.append(bunch.x[::3].copy())
+        particle_monitor.flush()
+        p = hp.File(self.p_fn + '.h5part', 'r')
+        self.assertEqual(len(p.keys()), self.n_turns)
+        for i in range(self.n_turns):
+            self.assertTrue(np.allclose(p['Step#' + str(i)]['x'],
+                                        x_dumped[i]),
+                            'ParticleMonitor data wrong at step ' + str(i))
+        p.close()
+
 
     def generate_mock_bunch(self):
         '''
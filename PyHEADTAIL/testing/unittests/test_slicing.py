@@ -138,6 +138,29 @@ class TestSlicing(unittest.TestCase):
                                    msg='The effective emittance is not the ' +
                                    'same as the emittance for no dispersion')
 
+    def test_single_precision_statistics(self):
+        """ Tests whether the bunch and slice statistics of a beam with
+        float32 coordinates (mixed with float64 ones) agree with the
+        statistics in double precision
+        """
+        bunch = self.create_bunch_with_params(1, 42, 0., 20)
+        slicer = UniformBinSlicer(self.nslices, n_sigma_z=2)
+        stats = ['mean_x', 'sigma_x', 'epsn_x', 'eff_epsn_x']
+        def get_stats():
+            slice_set = slicer.slice(bunch)
+            slicer.add_statistics(slice_set, bunch, stats)
+            return ([getattr(slice_set, stat) for stat in stats] +
+                    [bunch.epsn_x(), bunch.beta_Twiss_x(),
+                     bunch.alpha_Twiss_x()])
+        reference = get_stats()
+
+        bunch.x = bunch.x.astype(np.float32)
+        bunch.xp = bunch.xp.astype(np.float32)
+        for stat, value, value32 in zip(
+                stats + ['epsn_x()', 'beta_Twiss_x()', 'alpha_Twiss_x()'],
+                reference, get_stats()):
+            self.assertTrue(np.allclose(value32, value, rtol=1e-5, atol=0),
+                            stat + ' of the single precision beam deviates')
 
     # exclude this test for now, fails at the moment but not clear whether
     # this should be changed
@@ -12,7 +12,13 @@ from scipy.constants import c, e, m_p
 from PyHEADTAIL.particles.particles import Particles
 import PyHEADTAIL.trackers.transverse_tracking as pure_py
 from PyHEADTAIL.trackers.detuners import AmplitudeDetuning
+from PyHEADTAIL.trackers.longitudinal_tracking import LinearMap, RFSystems
 from PyHEADTAIL.general.printers import SilentPrinter
+try:
+    from PyHEADTAIL.trackers.fused import FusedLinearMap, FusedRFSystems
+    has_numba = True
+except ImportError:
+    has_numba = False
 
 class TestTransverseTracking(unittest.TestCase):
     '''Tests for functions and classes in the
@@ -68,7 +74,80 @@ class TestTransverseTracking(unittest.TestCase):
         for s in pure_python_map:
             s.track(beam_p)
 
-    def create_bunch(self):
+    @unittest.skipUnless(has_numba, 'numba not found')
+    def test_fused_linear_map(self):
+        '''Tests whether the FusedLinearMap yields the same results as
+        tracking through the last TransverseSegmentMap and the LinearMap
+        one after the other, also when changing Q_s in between
+        '''
+        pure_python_map = pure_py.TransverseMap(
+            self.s, self.alpha_x, self.beta_x,
+            self.Dx, self.alpha_y, self.beta_y, self.Dy, self.Qx, self.Qy,
+            printer=SilentPrinter()
+        )
+        linear_map = LinearMap([1e-3], self.circumference, 0.017,
+                               D_x=self.Dx[0], D_y=self.Dy[0])
+        fused_map = FusedLinearMap(pure_python_map[-1], linear_map)
+
+        beam_p = self.create_bunch()
+        beam_f = self.create_bunch()
+
+        for i in range(3):
+            if i == 2:
+                linear_map.Q_s = 0.021
+            pure_python_map[-1].track(beam_p)
+            linear_map.track(beam_p)
+            fused_map.track(beam_f)
+
+        for coord in ['x', 'xp', 'y', 'yp', 'z', 'dp']:
+            self.assertTrue(np.allclose(getattr(beam_p, coord),
+                                        getattr(beam_f, coord)),
+                            coord + ' differs between FusedLinearMap and ' +
+                            'sequential tracking')
+
+    @unittest.skipUnless(has_numba, 'numba not found')
+    def test_fused_rf_systems(self):
+        '''Tests whether the FusedRFSystems yields the same results as
+        tracking through the last TransverseSegmentMap and a stationary
+        or accelerating RFSystems one after the other, also when
+        changing the RF voltage in between
+        '''
+        pure_python_map = pure_py.TransverseMap(
+            self.s, self.alpha_x, self.beta_x,
+            self.Dx, self.alpha_y, self.beta_y, self.Dy, self.Qx, self.Qy,
+            printer=SilentPrinter()
+        )
+        gamma = 18.
+        for p_increment in [0, 1e-23]:
+            rf_systems = [RFSystems(self.circumference, [1, 2], [1e5, 5e4],
+                                    [0, np.pi], [1e-3], gamma,
+                                    p_increment=p_increment,
+                                    D_x=self.Dx[0], D_y=self.Dy[0],
+                                    charge=e, mass=m_p) for i in range(2)]
+            fused_map = FusedRFSystems(pure_python_map[-1], rf_systems[1])
+
+            beam_p = self.create_bunch(mass=m_p, gamma=gamma)
+            beam_f = self.create_bunch(mass=m_p, gamma=gamma)
+            beam_p.dp *= 1e-2
+            beam_f.dp *= 1e-2
+
+            for i in range(4):
+                if i == 2:
+                    for rf in rf_systems:
+                        rf.voltages[0] = 8e4
+                pure_python_map[-1].track(beam_p)
+                rf_systems[0].track(beam_p)
+                fused_map.track(beam_f)
+
+            self.assertAlmostEqual(beam_p.gamma, beam_f.gamma, places=12)
+            for coord in ['x', 'xp', 'y', 'yp', 'z', 'dp']:
+                self.assertTrue(np.allclose(getattr(beam_p, coord),
+                                            getattr(beam_f, coord),
+                                            rtol=1e-8, atol=1e-12),
+                                coord + ' differs between FusedRFSystems ' +
+                                'and sequential tracking')
+
+    def create_bunch(self, mass=1, gamma=18.):
         np.random.seed(0) #set seed to make results reproducible
         x = np.random.uniform(-0.1, 0.1, self.macroparticlenumber)
         y = np.random.uniform(-0.1, 0.1, self.macroparticlenumber)
@@ -81,8 +160,8 @@ class TestTransverseTracking(unittest.TestCase):
             'xp': xp, 'yp': yp, 'dp': dp
         }
         return Particles(
-            self.macroparticlenumber, 1, e, 1, #never mind the other params
-            1, 18., coords_n_momenta_dict
+            self.macroparticlenumber, 1, e, mass, #never mind the other params
+            1, gamma, coords_n_momenta_dict
         )
 
 if __name__ == '__main__':
@@ -0,0 +1,191 @@
+"""
+@brief Cython scalar evaluation and root finding for the multi-harmonic
+       RF force field and potential energy of an RFBucket.
+@copyright CERN
+
+For root finding, the field is sampled at the given points and every
+sign change is polished with the C implementation of
+scipy.optimize.brentq via scipy.optimize.cython_optimize, so that the
+callback evaluating the field never returns to Python.
+"""
+
+import numpy as np
+cimport numpy as np
+cimport libc.math as cmath
+
+cimport cython.boundscheck
+cimport cython.cdivision
+cimport cython.wraparound
+
+from scipy.optimize.cython_optimize cimport brentq
+
+
+"""Field identifiers for the kind argument of find_all_roots."""
+FORCE = 0
+POTENTIAL = 1
+
+"""Default tolerances and iteration limit of scipy.optimize.brentq ."""
+XTOL = 2e-12
+RTOL = 4 * np.finfo(float).eps
+MAXITER = 100
+
+
+ctypedef struct rf_params:
+    double *h
+    double *V
+    double *dphi
+    int n_harmonics
+    double R
+    double q_over_C
+    double deltaE_over_C
+    double v_offset
+
+ctypedef double (*field_type)(double, void*) noexcept nogil
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef inline double _rf_force_scalar(double z, rf_params *p) noexcept nogil:
+    """ Stationary multi-harmonic RF electric force field at position z
+    in units of Coul*Volt/metre. """
+    cdef double f = 0.
+    cdef int i
+    for i in range(p.n_harmonics):
+        f += p.V[i] * cmath.sin(p.h[i] * z / p.R + p.dphi[i])
+    return p.q_over_C * f
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef inline double _rf_potential_scalar(double z, rf_params *p) noexcept nogil:
+    """ Stationary multi-harmonic RF electric potential energy at
+    position z in units of Coul*Volt. """
+    cdef double v = 0.
+    cdef int i
+    for i in range(p.n_harmonics):
+        v += p.R / p.h[i] * p.V[i] * cmath.cos(p.h[i] * z / p.R + p.dphi[i])
+    return p.q_over_C * v
+
+
+cdef double _total_force_scalar(double z, void *args) noexcept nogil:
+    """ Total multi-harmonic RF electric force field including the
+    acceleration offset at position z in units of Coul*Volt/metre. """
+    cdef rf_params *p = <rf_params *> args
+    return _rf_force_scalar(z, p) - p.deltaE_over_C
+
+
+cdef double _total_potential_scalar(double z, void *args) noexcept nogil:
+    """ Total multi-harmonic RF electric potential energy including the
+    linear acceleration slope at position z, shifted by v_offset,
+    in units of Coul*Volt. """
+    cdef rf_params *p = <rf_params *> args
+    return _rf_potential_scalar(z, p) + p.deltaE_over_C * z - p.v_offset
+
+
+cdef class RFFields:
+    """ Multi-harmonic RF electric force field and potential energy of
+    an RFBucket evaluated at scalar positions z in C, avoiding the
+    numpy dispatch overhead of the array implementation for scalar
+    calls (e.g. from scipy quadratures or root finders).
+    """
+    cdef rf_params params
+    cdef readonly object h_arr, V_arr, dphi_arr
+
+    def __init__(self, h_arr, V_arr, dphi_arr, double R, double q_over_C,
+                 double deltaE_over_C):
+        """ Args:
+            h_arr, V_arr, dphi_arr: harmonics, voltages and phase
+                offsets of the RF elements
+            R: machine radius
+            q_over_C: absolute charge over circumference
+            deltaE_over_C: energy gain per turn over circumference
+        """
+        # keep references to the buffers the parameters point to
+        self.h_arr = np.ascontiguousarray(h_arr, dtype=np.float64)
+        self.V_arr = np.ascontiguousarray(V_arr, dtype=np.float64)
+        self.dphi_arr = np.ascontiguousarray(dphi_arr, dtype=np.float64)
+        cdef double[::1] h = self.h_arr
+        cdef double[::1] V = self.V_arr
+        cdef double[::1] dphi = self.dphi_arr
+        self.params.h = &h[0]
+        self.params.V = &V[0]
+        self.params.dphi = &dphi[0]
+        self.params.n_harmonics = h.shape[0]
+        self.params.R = R
+        self.params.q_over_C = q_over_C
+        self.params.deltaE_over_C = deltaE_over_C
+        self.params.v_offset = 0.
+
+    def force(self, double z, bint acceleration=True):
+        """ Return the RF electric force field at z, including the
+        acceleration offset if acceleration is True. """
+        cdef double f = _rf_force_scalar(z, &self.params)
+        if acceleration:
+            f -= self.params.deltaE_over_C
+        return f
+
+    def potential(self, double z, bint acceleration=True,
+                  double v_offset=0.):
+        """ Return the RF electric potential energy at z, including the
+        linear acceleration slope shifted by v_offset if acceleration
+        is True. """
+        cdef double v = _rf_potential_scalar(z, &self.params)
+        if acceleration:
+            v += self.params.deltaE_over_C * z - v_offset
+        return v
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def find_all_roots(int kind, double[::1] x, double[::1] h_arr,
+                   double[::1] V_arr, double[::1] dphi_arr, double R,
+                   double q_over_C, double deltaE_over_C,
+                   double v_offset=0., double xtol=XTOL, double rtol=RTOL,
+                   int maxiter=MAXITER):
+    """ Return all roots of the multi-harmonic RF force field
+    (kind=FORCE) or potential energy (kind=POTENTIAL) along x.
+    Each sign change between adjacent samples x[i], x[i+1] is
+    polished by Brent's method, equivalent to
+    cobra_functions.curve_tools.zero_crossings .
+    Args:
+        x: monotonic sampling points along z
+        h_arr, V_arr, dphi_arr: harmonics, voltages and phase offsets
+            of the RF elements
+        R: machine radius
+        q_over_C: absolute charge over circumference
+        deltaE_over_C: energy gain per turn over circumference
+        v_offset: potential energy offset (only for kind=POTENTIAL)
+    """
+    cdef rf_params p
+    p.h = &h_arr[0]
+    p.V = &V_arr[0]
+    p.dphi = &dphi_arr[0]
+    p.n_harmonics = h_arr.shape[0]
+    p.R = R
+    p.q_over_C = q_over_C
+    p.deltaE_over_C = deltaE_over_C
+    p.v_offset = v_offset
+
+    cdef field_type field
+    if kind == FORCE:
+        field = _total_force_scalar
+    else:
+        field = _total_potential_scalar
+
+    cdef int n = x.shape[0]
+    cdef np.ndarray[double, ndim=1] roots = np.empty(max(n - 1, 0))
+    cdef int n_roots = 0
+    cdef int i
+    cdef double y_pre, y_cur
+    with nogil:
+        y_pre = field(x[0], &p)
+        for i in range(n - 1):
+            y_cur = field(x[i + 1], &p)
+            if y_pre * y_cur < 0:
+                roots[n_roots] = brentq(field, x[i], x[i + 1], &p,
+                                        xtol, rtol, maxiter, NULL)
+                n_roots += 1
+            y_pre = y_cur
+    return roots[:n_roots]
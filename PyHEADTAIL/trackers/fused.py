@@ -0,0 +1,310 @@
+'''
+.. copyright:: CERN
+
+Numba compiled one pass tracking through a linear transverse segment
+followed by a longitudinal one turn map.
+
+Instead of streaming the particle arrays once per element (and
+allocating the temporaries of every numpy expression), the kernels
+update each macroparticle in place in a single loop which numba
+parallelises over the available threads (particle decomposition,
+the number of threads is controlled via numba.set_num_threads).
+FusedLinearMap is equivalent to
+
+    >>> transverse_segment_map.track(beam)
+    >>> linear_map.track(beam)
+
+and FusedRFSystems to
+
+    >>> transverse_segment_map.track(beam)
+    >>> rf_systems.track(beam)
+
+up to the rounding differences permitted by fastmath.
+
+Inside a GPU context (pm.device == 'GPU') the same kernels run as
+pycuda ElementwiseKernels on the GPU resident particle arrays, cf.
+gpu.gpu_wrap.fused_linear_turn and gpu.gpu_wrap.fused_rf_turn,
+such that the coordinates stay on the device during tracking.
+
+Importing this module raises an ImportError if numba is not
+installed.
+'''
+
+import numpy as np
+from numba import njit, prange
+from scipy.constants import c
+
+from PyHEADTAIL.general import pmath as pm
+from PyHEADTAIL.general.element import Element
+from PyHEADTAIL.particles.slicing import clean_slices
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def track_turn(x, xp, y, yp, z, dp,
+               M00, M01, M10, M11, M22, M23, M32, M33,
+               D_x_s0, D_x_s1, D_y_s0, D_y_s1,
+               cosdQ_s, sindQ_s, longfac, D_x, D_y):
+    '''Transport the particle coordinates in place through the
+    transverse segment with transfer matrix elements Mij and then
+    rotate the longitudinal phase space by the synchrotron phase
+    advance. Dispersion is subtracted before and added back after
+    each of the two steps, cf. TransverseSegmentMap and
+    LinearMap.track_with_dispersion .
+    '''
+    for i in prange(x.shape[0]):
+        dp0 = dp[i]
+        x0 = x[i] - D_x_s0 * dp0
+        y0 = y[i] - D_y_s0 * dp0
+        xp0 = xp[i]
+        yp0 = yp[i]
+
+        x1 = M00 * x0 + M01 * xp0 + (D_x_s1 - D_x) * dp0
+        y1 = M22 * y0 + M23 * yp0 + (D_y_s1 - D_y) * dp0
+        xp[i] = M10 * x0 + M11 * xp0
+        yp[i] = M32 * y0 + M33 * yp0
+
+        z0 = z[i]
+        dp1 = dp0 * cosdQ_s + z0 / longfac * sindQ_s
+        z[i] = z0 * cosdQ_s - longfac * dp0 * sindQ_s
+        dp[i] = dp1
+        x[i] = x1 + D_x * dp1
+        y[i] = y1 + D_y * dp1
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def track_turn_rf(x, xp, y, yp, z, dp,
+                  M00, M01, M10, M11, M22, M23, M32, M33,
+                  D_x_s0, D_x_s1, D_y_s0, D_y_s1,
+                  eta_0, length_0, beta_ratio_1, eta_1, length_1,
+                  amplitudes, wavenumbers, phases, p_increments,
+                  p0_before, p0_after, D_x, D_y):
+    '''Transport the particle coordinates in place through the
+    transverse segment with transfer matrix elements Mij and then
+    through the drift - kicks - drift sequence of RFSystems.
+
+    Arguments for the longitudinal part:
+        - eta_0, eta_1: slippage factor expansion coefficients
+          (in orders of dp) during the first and second drift
+        - length_0, length_1: lengths of the drifts
+        - beta_ratio_1: shrinkage ratio of the second drift
+        - amplitudes, wavenumbers, phases: per kick, the kick
+          amplitude |q|*V/(beta*c), the RF wave number 2*pi*h/C and
+          the total phase offset
+        - p_increments, p0_before, p0_after: per kick, the momentum
+          increment and the reference momentum before and after it
+        - D_x, D_y: per kick, the horizontal and vertical dispersion
+    '''
+    n_eta_0 = eta_0.shape[0]
+    n_eta_1 = eta_1.shape[0]
+    n_kicks = amplitudes.shape[0]
+    for i in prange(z.shape[0]):
+        dpi = dp[i]
+        x0 = x[i] - D_x_s0 * dpi
+        y0 = y[i] - D_y_s0 * dpi
+        xp0 = xp[i]
+        yp0 = yp[i]
+        xi = M00 * x0 + M01 * xp0 + D_x_s1 * dpi
+        yi = M22 * y0 + M23 * yp0 + D_y_s1 * dpi
+        xp[i] = M10 * x0 + M11 * xp0
+        yp[i] = M32 * y0 + M33 * yp0
+
+        eta = 0.
+        for j in range(n_eta_0 - 1, -1, -1):
+            eta = eta * dpi + eta_0[j]
+        zi = z[i] - eta * dpi * length_0
+
+        for k in range(n_kicks):
+            xi -= D_x[k] * dpi
+            yi -= D_y[k] * dpi
+            delta_p = dpi * p0_before[k]
+            delta_p += (amplitudes[k] * np.sin(wavenumbers[k] * zi +
+                                               phases[k]) -
+                        p_increments[k])
+            dpi = delta_p / p0_after[k]
+            xi += D_x[k] * dpi
+            yi += D_y[k] * dpi
+
+        eta = 0.
+        for j in range(n_eta_1 - 1, -1, -1):
+            eta = eta * dpi + eta_1[j]
+        z[i] = beta_ratio_1 * zi - eta * dpi * length_1
+        dp[i] = dpi
+        x[i] = xi
+        y[i] = yi
+
+
+def _segment_coefficients(segment_map):
+    '''Return the transfer matrix elements (M00, M01, M10, M11, M22,
+    M23, M32, M33) and dispersion parameters (D_x_s0, D_x_s1, D_y_s0,
+    D_y_s1) of the given TransverseSegmentMap without detuners.
+    '''
+    if segment_map.segment_detuners:
+        raise ValueError('Fused tracking does not support transverse ' +
+                         'segments with detuners.')
+    dphi_x = 2 * np.pi * segment_map.dQ_x
+    dphi_y = 2 * np.pi * segment_map.dQ_y
+    I, J = segment_map.I, segment_map.J
+    M_x = I * np.cos(dphi_x) + J * np.sin(dphi_x)
+    M_y = I * np.cos(dphi_y) + J * np.sin(dphi_y)
+    M = (M_x[0, 0], M_x[0, 1], M_x[1, 0], M_x[1, 1],
+         M_y[2, 2], M_y[2, 3], M_y[3, 2], M_y[3, 3])
+
+    # the segment map ignores negligible dispersion, cf.
+    # TransverseSegmentMap.__init__
+    if segment_map._track == segment_map._track_with_dispersion:
+        D = (segment_map.D_x_s0, segment_map.D_x_s1,
+             segment_map.D_y_s0, segment_map.D_y_s1)
+    else:
+        D = (0., 0., 0., 0.)
+    return M, D
+
+
+class FusedLinearMap(Element):
+    '''Replaces a TransverseSegmentMap and the subsequent LinearMap of
+    a one turn map by one compiled tracking kernel. The transfer
+    matrix of the transverse segment is computed once at instantiation,
+    hence segments with detuners (amplitude detuning, chromaticity)
+    are not supported.
+    '''
+    def __init__(self, segment_map, linear_map, *args, **kwargs):
+        '''segment_map is the TransverseSegmentMap and linear_map the
+        LinearMap tracked right after it.
+        '''
+        self.segment_map = segment_map
+        self.linear_map = linear_map
+
+        self._M, self._D_segment = _segment_coefficients(segment_map)
+
+    @clean_slices
+    def track(self, beam):
+        # like LinearMap, take changes of Q_s into account at every turn
+        dQ_s = 2 * np.pi * self.linear_map.Q_s
+        omega_s = dQ_s * beam.beta * c / self.linear_map.circumference
+        longfac = (self.linear_map.eta(0, beam.gamma) * beam.beta * c /
+                   omega_s)
+        coefficients = self._M + self._D_segment + (
+            np.cos(dQ_s), np.sin(dQ_s), longfac,
+            self.linear_map.D_x, self.linear_map.D_y)
+        if pm.device == 'GPU':
+            pm.gpu_wrap.fused_linear_turn(
+                beam.x, beam.xp, beam.y, beam.yp, beam.z, beam.dp,
+                *coefficients)
+        else:
+            track_turn(beam.x, beam.xp, beam.y, beam.yp, beam.z, beam.dp,
+                       *coefficients)
+
+
+class FusedRFSystems(Element):
+    '''Replaces a TransverseSegmentMap and the subsequent RFSystems of
+    a one turn map by one compiled tracking kernel, parallelised over
+    the macroparticles. The kick parameters are read from the RFSystems
+    at every turn, such that changes of its voltages, harmonics,
+    phi_offsets and p_increment are taken into account. The parameter
+    arrays passed to the kernel are only rebuilt when these or the
+    reference momentum of the beam or the device change. As for
+    FusedLinearMap, segments with detuners are not supported.
+    '''
+    def __init__(self, segment_map, rf_systems, *args, **kwargs):
+        '''segment_map is the TransverseSegmentMap and rf_systems the
+        RFSystems tracked right after it.
+        '''
+        self.segment_map = segment_map
+        self.rf_systems = rf_systems
+
+        self._M, self._D_segment = _segment_coefficients(segment_map)
+        self._parameter_key = None
+
+    @staticmethod
+    def _eta_coefficients(drift, gamma):
+        '''Return the slippage factor expansion coefficients of the
+        drift in orders of dp, cf. LongitudinalMap.eta .
+        '''
+        return np.array([getattr(drift, '_eta' + str(i))(
+            drift.alpha_array, gamma)
+            for i in range(len(drift.alpha_array))])
+
+    def _update_parameters(self, beam, drift_0, drift_1, kicks):
+        '''Compute the slippage factor coefficients of both drifts
+        and the per kick parameter arrays of track_turn_rf for the
+        current reference momentum of the beam, on the current device
+        (pm.device). beam.p0 is left unchanged, the reference momentum
+        after all kicks is stored in self._p0_final .
+        '''
+        p0_initial = beam.p0
+        self._eta_0 = self._eta_coefficients(drift_0, beam.gamma)
+
+        # the kicks update the reference momentum one after the other
+        n_kicks = len(kicks)
+        amplitudes = np.empty(n_kicks)
+        wavenumbers = np.empty(n_kicks)
+        phases = np.empty(n_kicks)
+        p_increments = np.empty(n_kicks)
+        p0_before = np.empty(n_kicks)
+        p0_after = np.empty(n_kicks)
+        D_x = np.empty(n_kicks)
+        D_y = np.empty(n_kicks)
+        for k, kick in enumerate(kicks):
+            amplitudes[k] = np.abs(beam.charge)*kick.voltage / (beam.beta*c)
+            wavenumbers[k] = 2*np.pi*kick.harmonic / kick.circumference
+            phases[k] = kick.phi_offset + kick._phi_lock
+            p_increments[k] = kick.p_increment
+            p0_before[k] = beam.p0
+            beam.p0 += kick.p_increment
+            p0_after[k] = beam.p0
+            D_x[k] = kick.D_x
+            D_y[k] = kick.D_y
+        # inside a GPU context the arrays are transferred once here
+        # instead of at every turn
+        self._kick_parameters = tuple(map(pm.ensure_same_device, (
+            amplitudes, wavenumbers, phases, p_increments,
+            p0_before, p0_after, D_x, D_y)))
+
+        self._eta_0 = pm.ensure_same_device(self._eta_0)
+        self._eta_1 = pm.ensure_same_device(
+            self._eta_coefficients(drift_1, beam.gamma))
+        self._p0_final = beam.p0
+        beam.p0 = p0_initial
+
+    @clean_slices
+    def track(self, beam):
+        rf_systems = self.rf_systems
+        drift_0 = rf_systems._elements[0]
+        drift_1 = rf_systems._elements[-1]
+        kicks = rf_systems._elements[1:-1]
+        betagamma_old = beam.betagamma
+
+        if drift_0.shrinkage_p_increment:
+            raise ValueError('FusedRFSystems does not support shrinkage ' +
+                             'in the first drift.')
+
+        parameter_key = (
+            pm.device, beam.p0, beam.charge, tuple(drift_0.alpha_array),
+            tuple(drift_1.alpha_array),
+            tuple((kick.voltage, kick.harmonic, kick.circumference,
+                   kick.phi_offset, kick._phi_lock, kick.p_increment,
+                   kick.D_x, kick.D_y) for kick in kicks))
+        if parameter_key != self._parameter_key:
+            self._update_parameters(beam, drift_0, drift_1, kicks)
+            self._parameter_key = parameter_key
+
+        beam.p0 = self._p0_final
+        beta_ratio_1 = 1 - drift_1.shrinkage_p_increment / (
+            beam.gamma**3 * beam.p0)
+
+        longitudinal = ((self._eta_0, drift_0.length, beta_ratio_1,
+                         self._eta_1, drift_1.length) +
+                        self._kick_parameters)
+        if pm.device == 'GPU':
+            pm.gpu_wrap.fused_rf_turn(
+                beam.x, beam.xp, beam.y, beam.yp, beam.z, beam.dp,
+                self._M, self._D_segment, *longitudinal)
+        else:
+            track_turn_rf(
+                beam.x, beam.xp, beam.y, beam.yp, beam.z, beam.dp,
+                *(self._M + self._D_segment + longitudinal))
+
+        if rf_systems.p_increment:
+            if rf_systems.track != rf_systems.track_no_transverse_shrinking:
+                rf_systems._shrink_transverse_emittance(
+                    beam, np.sqrt(betagamma_old / beam.betagamma))
+            rf_systems.clean_buckets()
@@ -4,15 +4,20 @@
 
 import numpy as np
 from scipy.constants import c
+from scipy.integrate import trapezoid
 from scipy.optimize import newton
-from scipy.integrate import dblquad
 from functools import partial, wraps
 
 from PyHEADTAIL.cobra_functions.curve_tools import (
     zero_crossings as cvt_zero_crossings)
 from PyHEADTAIL.general.decorators import deprecated
 from PyHEADTAIL.general.element import Printing
-from functools import reduce
+
+try:
+    from PyHEADTAIL.trackers import _bucket_fast
+    has_bucket_fast = True
+except ImportError:
+    has_bucket_fast = False
 
 
 def attach_clean_buckets(rf_parameter_changing_method, rfsystems_instance):
@@ -71,14 +76,17 @@ class RFBucket(Printing):
         self._gamma = gamma
         self._beta = np.sqrt(1 - gamma**-2)
         self._p0 = np.sqrt(gamma**2 - 1) * mass * c
+        self._p0_beta_c = self._p0 * self._beta * c
 
-        self.alpha0 = alpha_array[0]
-        self.p_increment = p_increment
+        self._alpha0 = alpha_array[0]
+        self._p_increment = p_increment
+        self._circumference = circumference
+        self._update_machine_parameters()
 
-        self.circumference = circumference
         self.h = harmonic_list
         self.V = voltage_list
         self.dphi = phi_offset_list
+        self._update_harmonic_arrays()
 
         """Additional electric force fields to be added on top of the
         RF electric force field.
@@ -88,8 +96,13 @@ class RFBucket(Printing):
         of the RF electric potential energy.
         """
         self._add_potentials = []
+        """Stationary total potential energy at the separatrix
+        defining unstable fix point, keyed by ignore_add_potentials,
+        cf. self._get_pot_boundary .
+        """
+        self._pot_boundary_cache = {}
 
-        zmax = self.circumference / (2*np.amin(self.h))
+        zmax = self.circumference / (2*self.h_arr.min())
 
         if z_offset is None:
             # i_fund = np.argmin(self.h) # index of fundamental RF element
@@ -107,9 +120,8 @@ class RFBucket(Printing):
             ### separatrix UFPs via their minimal (convexified) potential value
             domain_to_find_bucket_centre = np.linspace(-1.999*zmax, 1.999*zmax,
                                                        self.sampling_points)
-            z0 = self.zero_crossings(
-                partial(self.total_force, acceleration=False),
-                domain_to_find_bucket_centre)
+            z0 = self._rf_zero_crossings(
+                'force', domain_to_find_bucket_centre, acceleration=False)
             convex_pot0 = (
                 np.array(self.total_potential(z0, acceleration=False)) *
                 np.sign(self.eta0) / self.charge)  # charge for numerical reasons
@@ -140,9 +152,31 @@ class RFBucket(Printing):
     def p0(self):
         return self._p0
 
+    @property
+    def circumference(self):
+        return self._circumference
+
+    @property
+    def alpha0(self):
+        return self._alpha0
+    @alpha0.setter
+    def alpha0(self, value):
+        self._alpha0 = value
+        self._update_machine_parameters()
+        self._update_harmonic_arrays()
+
+    @property
+    def p_increment(self):
+        return self._p_increment
+    @p_increment.setter
+    def p_increment(self, value):
+        self._p_increment = value
+        self._update_machine_parameters()
+        self._update_harmonic_arrays()
+
     @property
     def deltaE(self):
-        return self.p_increment * self.beta * c
+        return self._deltaE
 
     @property
     def harmonic_list(self):
@@ -150,6 +184,7 @@ class RFBucket(Printing):
     @harmonic_list.setter
     def harmonic_list(self, value):
         self.h = value
+        self._update_harmonic_arrays()
 
     @property
     def voltage_list(self):
@@ -157,6 +192,7 @@ class RFBucket(Printing):
     @voltage_list.setter
     def voltage_list(self, value):
         self.V = value
+        self._update_harmonic_arrays()
 
     @property
     def phi_offset_list(self):
@@ -164,6 +200,40 @@ class RFBucket(Printing):
     @phi_offset_list.setter
     def phi_offset_list(self, value):
         self.dphi = value
+        self._update_harmonic_arrays()
+
+    def _update_machine_parameters(self):
+        '''Derive the slippage factor, the energy gain per turn and
+        the machine radius from alpha0, p_increment and circumference.
+        (The circumference is fixed at instantiation as it determines
+        self.interval .)
+        '''
+        self._eta0 = self._alpha0 - self._gamma**-2
+        self._deltaE = self._p_increment * self._beta * c
+        self._R = self._circumference / (2*np.pi)
+        self._deltaE_over_C = self._deltaE / self._circumference
+
+    def _update_harmonic_arrays(self):
+        '''Store the RF parameter lists as float arrays such that all
+        harmonics can be evaluated at once, cf. self._fused_harmonics .
+        coef_arr are the force field amplitudes of the harmonics in
+        units of Coul*Volt/metre.
+        '''
+        self.h_arr = np.asarray(self.h, dtype=np.float64)
+        self.V_arr = np.asarray(self.V, dtype=np.float64)
+        self.dphi_arr = np.asarray(self.dphi, dtype=np.float64)
+        self.coef_arr = np.abs(self.charge) * self.V_arr / self.circumference
+        for attr in ["_Q_s", "_beta_z", "_trig_cache"]:
+            try:
+                delattr(self, attr)
+            except AttributeError:
+                pass
+        self._clear_bucket_caches()
+        if has_bucket_fast:
+            self._ext = _bucket_fast.RFFields(
+                self.h_arr, self.V_arr, self.dphi_arr, self._R,
+                np.abs(self.charge) / self.circumference,
+                self._deltaE_over_C)
 
     @property
     def z_ufp(self):
@@ -249,16 +319,20 @@ class RFBucket(Printing):
 
     @property
     def R(self):
-        return self.circumference/(2*np.pi)
+        return self._R
 
     # should make use of eta functionality of LongitudinalMap at some point
     @property
     def eta0(self):
-        return self.alpha0 - self.gamma**-2
+        return self._eta0
 
     @property
     def beta_z(self):
-        return np.abs(self.eta0 * self.R / self.Q_s)
+        try:
+            return self._beta_z
+        except AttributeError:
+            self._beta_z = np.abs(self._eta0 * self._R / self.Q_s)
+            return self._beta_z
 
     @property
     @deprecated('--> Use Q_s instead!')
@@ -271,12 +345,13 @@ class RFBucket(Printing):
         center of the bucket. Analytical formula neglects any
         added forces / potentials via add_fields.
         """
-        hV = sum([h * self.V[i] for i, h in enumerate(self.h)])
-        # if hV == 0:
-        #     ix = np.argmax(self.V)
-        #     hV = self.h[ix] * self.V[ix]
-        return np.sqrt(np.abs(self.charge)*np.abs(self.eta0)*hV /
-                       (2*np.pi*self.p0*self.beta*c))
+        try:
+            return self._Q_s
+        except AttributeError:
+            hV = self.h_arr.dot(self.V_arr)
+            self._Q_s = np.sqrt(np.abs(self.charge)*np.abs(self._eta0)*hV /
+                                (2*np.pi*self._p0_beta_c))
+            return self._Q_s
 
     def add_fields(self, add_forces, add_potentials):
         '''Include additional (e.g. non-RF) effects to this RFBucket.
@@ -293,30 +368,128 @@ class RFBucket(Printing):
         add_potentials is expected to be an iterable of functions of z,
         in units of Coul*Volt.
 
-        Bucket shape parameters z_ufp, z_sfp, z_left and z_right are
-        recalculated.
+        Bucket shape parameters z_ufp, z_sfp, z_left and z_right as
+        well as the separatrix are recalculated.
         '''
         self._add_forces += add_forces
         self._add_potentials += add_potentials
+        self._clear_bucket_caches()
+
+    def _clear_bucket_caches(self):
+        '''Delete all cached quantities depending on the bucket shape,
+        to be called whenever the RF parameters or the additional
+        fields change.
+        '''
+        for attrs in [("_z_ufp", "_z_sfp"), ("_z_left", "_z_right"),
+                      ("_separatrix_fn",), ("_h_sfp_convex",),
+                      ("_pot_lut_z", "_pot_lut_v")]:
+            try:
+                for attr in attrs:
+                    delattr(self, attr)
+            except AttributeError:
+                pass
+        self._pot_boundary_cache = {}
+
+    # FORCE FIELDS AND POTENTIALS OF MULTI-HARMONIC ACCELERATING BUCKET
+    # =================================================================
+    def _fused_harmonics(self, trig, z, amplitudes, h, dphi):
+        '''Return the sum over all harmonics i of
+        amplitudes[i] * trig(h[i] * z / self.R + dphi[i])
+        evaluated in one vectorised sweep over the (harmonics x z)
+        phase array. z may be a scalar or an array of any shape.
+        '''
+        phase = np.multiply.outer(z, h) / self.R + dphi
+        return trig(phase).dot(amplitudes)
+
+    def _precompute_trig(self):
+        '''Return (z, sin_mat, cos_mat) with z the standard sampling
+        grid across self.interval and sin_mat, cos_mat the sine and
+        cosine of the phases h*z/R + dphi of all harmonics on z.
+        The result is cached such that the force field and potential
+        energy scans for the fix points and the bucket boundaries
+        share the transcendental evaluations. Only the Python root
+        finding uses this grid, i.e. if the Cython extension
+        _bucket_fast is not built or after add_fields.
+        '''
         try:
-            delattr(self, "_z_ufp")
-            delattr(self, "_z_sfp")
+            return self._trig_cache
         except AttributeError:
-            pass
+            z = np.linspace(*self.interval, num=self.sampling_points)
+            z.flags.writeable = False
+            phase = np.multiply.outer(z, self.h_arr) / self.R + self.dphi_arr
+            self._trig_cache = (z, np.sin(phase), np.cos(phase))
+            return self._trig_cache
+
+    def _cached_trig(self, z):
+        '''Return (sin_mat, cos_mat) of self._precompute_trig if z is
+        its cached sampling grid, otherwise None (always the case while
+        the Python root finding has not been used).
+        '''
         try:
-            delattr(self, "_z_left")
-            delattr(self, "_z_right")
+            z_grid, sin_mat, cos_mat = self._trig_cache
         except AttributeError:
-            pass
+            return None
+        if z is not z_grid:
+            return None
+        return sin_mat, cos_mat
+
+    def _force_from_trig(self, sin_mat):
+        return sin_mat.dot(self.coef_arr)
+
+    def _pot_from_trig(self, cos_mat):
+        return cos_mat.dot(self.coef_arr * self.R / self.h_arr)
+
+    def _total_force_array(self, z, ignore_add_forces=False):
+        '''Return the stationary total electric force field of
+        superimposed RF elements (multi-harmonics) and additional
+        force fields at z in units of Coul*Volt/metre.
+        '''
+        trig = self._cached_trig(z)
+        if trig is not None:
+            f = self._force_from_trig(trig[0])
+        else:
+            f = self._fused_harmonics(np.sin, z, self.coef_arr,
+                                      self.h_arr, self.dphi_arr)
+        if not ignore_add_forces:
+            f = f + sum(f_add(z) for f_add in self._add_forces)
+        return f
+
+    def _total_potential_array(self, z, ignore_add_potentials=False):
+        '''Return the stationary total electric potential energy of
+        superimposed RF elements (multi-harmonics) and additional
+        electric potentials at z in units of Coul*Volt.
+        '''
+        trig = self._cached_trig(z)
+        if trig is not None:
+            v = self._pot_from_trig(trig[1])
+        else:
+            v = self._fused_harmonics(np.cos, z,
+                                      self.coef_arr * self.R / self.h_arr,
+                                      self.h_arr, self.dphi_arr)
+        if not ignore_add_potentials:
+            v = v + sum(pot(z) for pot in self._add_potentials)
+        return v
+
+    def _get_pot_boundary(self, ignore_add_potentials=False):
+        '''Return the stationary total electric potential energy at
+        the unstable fix point enclosing the separatrix. The value is
+        cached until the bucket shape changes via add_fields.
+        '''
+        try:
+            return self._pot_boundary_cache[ignore_add_potentials]
+        except KeyError:
+            v = self._total_potential_array(self.z_ufp_separatrix,
+                                            ignore_add_potentials)
+            self._pot_boundary_cache[ignore_add_potentials] = v
+            return v
 
-    # FORCE FIELDS AND POTENTIALS OF MULTI-HARMONIC ACCELERATING BUCKET
-    # =================================================================
     def rf_force(self, V, h, dphi, p_increment, acceleration=True):
+        h = np.asarray(h, dtype=np.float64)
+        V = np.asarray(V, dtype=np.float64)
+        dphi = np.asarray(dphi, dtype=np.float64)
         def f(z):
             coefficient = np.abs(self.charge)/self.circumference
-            focusing_field = reduce(lambda x, y: x+y, [
-                V_i * np.sin(h_i*z/self.R + dphi_i)
-                for V_i, h_i, dphi_i in zip(V, h, dphi)])
+            focusing_field = self._fused_harmonics(np.sin, z, V, h, dphi)
             if not acceleration:
                 accelerating_field = 0
             else:
@@ -332,10 +505,12 @@ class RFBucket(Printing):
         self.add_nonRF_influences),
         evaluated at position z in units of Coul*Volt/metre.
         '''
-        f = (self.rf_force(self.V, self.h, self.dphi,
-                           self.p_increment, acceleration)(z) +
-             sum(f(z) for f in self._add_forces
-                 if not ignore_add_forces))
+        if (isinstance(z, float) and hasattr(self, '_ext') and
+                (ignore_add_forces or not self._add_forces)):
+            return self._ext.force(z, acceleration)
+        f = self._total_force_array(z, ignore_add_forces)
+        if acceleration:
+            f = f - self._deltaE_over_C
         return f
 
 
@@ -367,10 +542,7 @@ class RFBucket(Printing):
             superimposed RF elements (multi-harmonics) and additional
             force fields as a function of z in units of Coul*Volt/metre.
             '''
-            harmonics = (self.make_singleharmonic_force(V, h, dphi)(z)
-                         for V, h, dphi in zip(self.V, self.h, self.dphi))
-            return (sum(harmonics) + sum(f(z) for f in self._add_forces
-                                         if not ignore_add_forces))
+            return self._total_force_array(z, ignore_add_forces)
         return total_force
 
     @deprecated('--> Replace with "total_force" as soon as possible.\n')
@@ -381,9 +553,8 @@ class RFBucket(Printing):
         self.add_nonRF_influences),
         evaluated at position z in units of Coul*Volt/metre.
         '''
-        total_force = self.make_total_force(
-            ignore_add_forces=ignore_add_forces)
-        return total_force(z) - self.deltaE / self.circumference
+        return (self._total_force_array(z, ignore_add_forces) -
+                self._deltaE_over_C)
 
 
     def rf_potential(self, V, h, dphi, p_increment,
@@ -402,11 +573,13 @@ class RFBucket(Printing):
               shifted to zero at the unstable fix point enclosing
               the separatrix of the RF bucket (default=True).
         '''
+        h = np.asarray(h, dtype=np.float64)
+        V = np.asarray(V, dtype=np.float64)
+        dphi = np.asarray(dphi, dtype=np.float64)
         def vf(z):
             coefficient = np.abs(self.charge)/self.circumference
-            focusing_potential = reduce(lambda x, y: x+y, [
-                self.R/h[i] * V[i] * np.cos(h[i]*z/self.R + dphi[i])
-                for i in range(len(V))])
+            focusing_potential = self._fused_harmonics(
+                np.cos, z, self.R / h * V, h, dphi)
             return coefficient * focusing_potential
 
         if not acceleration:
@@ -449,10 +622,61 @@ class RFBucket(Printing):
               shifted to zero at the unstable fix point enclosing
               the separatrix of the RF bucket (default=True).
         '''
-        v = (self.rf_potential(self.V, self.h, self.dphi,
-                               self.p_increment, acceleration, offset)(z) +
-             sum(pot(z) for pot in self._add_potentials
-                 if not ignore_add_potentials))
+        if (isinstance(z, float) and hasattr(self, '_ext') and
+                (ignore_add_potentials or not self._add_potentials)):
+            v_offset = 0.
+            if acceleration and offset:
+                v_offset = (
+                    self._get_pot_boundary(ignore_add_potentials=True) +
+                    self._deltaE_over_C * self.z_ufp_separatrix)
+            v = self._ext.potential(z, acceleration, v_offset)
+            if make_convex:
+                v *= np.sign(self.eta0)
+            return v
+        v = self._total_potential_array(z, ignore_add_potentials)
+        if acceleration:
+            v = v + self._deltaE_over_C * z
+            if offset:
+                # the offset only accounts for the RF potential energy
+                z_boundary = self.z_ufp_separatrix
+                v = v - (self._get_pot_boundary(ignore_add_potentials=True) +
+                         self._deltaE_over_C * z_boundary)
+        if make_convex:
+            v *= np.sign(self.eta0)
+        return v
+
+    def _build_pot_lut(self, n_samples=8192):
+        '''Tabulate self.total_potential on n_samples uniformly spaced
+        points across self.interval .
+        '''
+        self._pot_lut_z = np.linspace(self.interval[0], self.interval[1],
+                                      n_samples)
+        self._pot_lut_v = self.total_potential(self._pot_lut_z)
+
+    def total_potential_fast(self, z, make_convex=False):
+        '''Return self.total_potential(z) (with default arguments)
+        linearly interpolated from a lookup table across
+        self.interval . The table is built on the first call and
+        rebuilt after add_fields. Points outside self.interval are
+        evaluated exactly.
+
+        Use this for repeated evaluations at large numbers of z,
+        e.g. via the use_lut argument of hamiltonian and
+        is_in_separatrix.
+        '''
+        try:
+            lut_z, lut_v = self._pot_lut_z, self._pot_lut_v
+        except AttributeError:
+            self._build_pot_lut()
+            lut_z, lut_v = self._pot_lut_z, self._pot_lut_v
+        z = np.asarray(z, dtype=np.float64)
+        v = np.interp(z, lut_z, lut_v)
+        outside = (z < lut_z[0]) | (z > lut_z[-1])
+        if np.any(outside):
+            if v.ndim == 0:
+                v = np.asarray(self.total_potential(z))
+            else:
+                v[outside] = self.total_potential(z[outside])
         if make_convex:
             v *= np.sign(self.eta0)
         return v
@@ -487,10 +711,7 @@ class RFBucket(Printing):
             electric potentials as a function of z
             in units of Coul*Volt.
             '''
-            harmonics = (self.make_singleharmonic_potential(V, h, dphi)(z)
-                         for V, h, dphi in zip(self.V, self.h, self.dphi))
-            return (sum(harmonics) + sum(pot(z) for pot in self._add_potentials
-                                         if not ignore_add_potentials))
+            return self._total_potential_array(z, ignore_add_potentials)
         return total_potential
 
     @deprecated('--> Replace with "total_potential as soon as possible.\n')
@@ -517,11 +738,10 @@ class RFBucket(Printing):
               make_convex=True in order to return
               sign(eta)*hamiltonian(z, dp).
         '''
-        pot_tot = self.make_total_potential(
-            ignore_add_potentials=ignore_add_potentials)
         z_boundary = self.z_ufp_separatrix
-        v_acc = (pot_tot(z) - pot_tot(z_boundary) +
-                 self.deltaE / self.circumference * (z - z_boundary))
+        v_acc = (self._total_potential_array(z, ignore_add_potentials) -
+                 self._get_pot_boundary(ignore_add_potentials) +
+                 self._deltaE_over_C * (z - z_boundary))
         if make_convex:
             v_acc *= np.sign(self.eta0)
         return v_acc
@@ -540,11 +760,48 @@ class RFBucket(Printing):
 
         return cvt_zero_crossings(f, x)
 
+    def _rf_zero_crossings(self, field, x=None, acceleration=True):
+        '''Determine roots along x of the total electric force field
+        (field='force') or the total electric potential energy
+        (field='potential') as given by total_force and total_potential.
+        If x is not explicitely given, take stationary bucket interval.
+
+        As long as no additional fields have been added via add_fields,
+        uses the compiled root finder of the Cython extension
+        _bucket_fast (if built), otherwise falls back to
+        self.zero_crossings .
+        '''
+        if field == 'force':
+            f = partial(self.total_force, acceleration=acceleration)
+            add_fields = self._add_forces
+        else:
+            f = partial(self.total_potential, acceleration=acceleration)
+            add_fields = self._add_potentials
+        if not has_bucket_fast or add_fields:
+            if x is None:
+                # share the harmonics' sin and cos between the scans
+                x = self._precompute_trig()[0]
+            return self.zero_crossings(f, x)
+
+        if x is None:
+            x = np.linspace(*self.interval, num=self.sampling_points)
+        deltaE_over_C = self._deltaE_over_C if acceleration else 0.
+        args = (x, self.h_arr, self.V_arr, self.dphi_arr, self.R,
+                np.abs(self.charge) / self.circumference, deltaE_over_C)
+        if field == 'force':
+            return _bucket_fast.find_all_roots(_bucket_fast.FORCE, *args)
+        v_offset = 0.
+        if acceleration:
+            v_offset = (self._get_pot_boundary(ignore_add_potentials=True) +
+                        self._deltaE_over_C * self.z_ufp_separatrix)
+        return _bucket_fast.find_all_roots(
+            _bucket_fast.POTENTIAL, *args, v_offset=v_offset)
+
     def _get_bucket_boundaries(self):
         '''Return the bucket boundaries as well as the whole list
         of acceleration voltage roots, (z_left, z_right, z_roots).
         '''
-        z0 = np.atleast_1d(self.zero_crossings(self.total_potential))
+        z0 = np.atleast_1d(self._rf_zero_crossings('potential'))
         z0 = np.append(z0, self.z_ufp)
         return np.min(z0), np.max(z0), z0
 
@@ -562,7 +819,7 @@ class RFBucket(Printing):
         of the total_force) by comparing the voltages between the
         out-most UFP.
         '''
-        z0 = np.atleast_1d(self.zero_crossings(self.total_force))
+        z0 = np.atleast_1d(self._rf_zero_crossings('force'))
 
         if not z0.size:
             # no bucket (i.e. bucket area 'negative')
@@ -598,7 +855,7 @@ class RFBucket(Printing):
 
     # HAMILTONIANS, SEPARATRICES AND RELATED FUNCTIONS
     # ================================================
-    def hamiltonian(self, z, dp, make_convex=False):
+    def hamiltonian(self, z, dp, make_convex=False, use_lut=False):
         '''Return the Hamiltonian at position z and dp in units of
         Coul*Volt/p0.
 
@@ -609,24 +866,37 @@ class RFBucket(Printing):
               where the stable fix points are located, set
               make_convex=True in order to return
               sign(eta)*hamiltonian(z, dp).
+            - use_lut: interpolate the potential energy from a lookup
+              table via self.total_potential_fast (default=False).
         '''
-        h = (-0.5 * self.eta0 * self.beta * c * dp**2 +
-             self.total_potential(z) / self.p0)
+        if use_lut:
+            v = self.total_potential_fast(z)
+        else:
+            v = self.total_potential(z)
+        h = (v - 0.5 * self._eta0 * self._p0_beta_c * dp**2) / self._p0
         if make_convex:
             h *= np.sign(self.eta0)
         return h
 
-    def equihamiltonian(self, zcut):
+    def equihamiltonian(self, zcut, use_lut=False):
         '''Return a function dp_at that encodes the equi-Hamiltonian
         contour line that cuts the z axis at (zcut, 0).
         In more detail, dp_at(z) returns the (positive) dp value at
         its given z argument such that
         self.hamiltonian(z, dp_at(z)) == self.hamiltonian(zcut, 0) .
+        For use_lut=True dp_at interpolates the potential energy from
+        a lookup table via self.total_potential_fast .
         '''
+        # potential energy at the cut, i.e. p0 * self.hamiltonian(zcut, 0)
+        vcut = self.total_potential(zcut)
+        scale = 2./(self._eta0*self._p0_beta_c)
+        if use_lut:
+            total_potential = self.total_potential_fast
+        else:
+            total_potential = self.total_potential
+
         def dp_at(z):
-            hcut = self.hamiltonian(zcut, 0)
-            r = np.abs(2./(self.eta0*self.beta*c) *
-                       (self.total_potential(z)/self.p0 - hcut))
+            r = np.abs(scale * (total_potential(z) - vcut))
             return np.sqrt(r.clip(min=0))
         return dp_at
 
@@ -634,7 +904,11 @@ class RFBucket(Printing):
         '''Return the positive dp value corresponding to the separatrix
         Hamiltonian contour line at the given z.
         '''
-        dp_separatrix_at = self.equihamiltonian(self.z_ufp_separatrix)
+        try:
+            dp_separatrix_at = self._separatrix_fn
+        except AttributeError:
+            dp_separatrix_at = self.equihamiltonian(self.z_ufp_separatrix)
+            self._separatrix_fn = dp_separatrix_at
         return dp_separatrix_at(z)
 
     def h_sfp(self, make_convex=False):
@@ -650,7 +924,7 @@ class RFBucket(Printing):
         dp_at = self.equihamiltonian(zcut)
         return np.amax(dp_at(self.z_sfp))
 
-    def is_in_separatrix(self, z, dp, margin=0):
+    def is_in_separatrix(self, z, dp, margin=0, use_lut=False):
         """Return boolean whether the coordinate (z, dp) is located
         strictly inside the separatrix of this bucket
         (i.e. excluding neighbouring buckets).
@@ -660,11 +934,22 @@ class RFBucket(Printing):
         (Use margin as a weighting factor in units of the Hamiltonian
         value at the stable fix point to move from the separatrix
         toward the extremal Hamiltonian value at self.z_sfp .)
+
+        For use_lut=True the potential energy is interpolated from a
+        lookup table via self.total_potential_fast .
         """
-        within_interval = np.logical_and(self.z_left < z, z < self.z_right)
-        within_separatrix = (self.hamiltonian(z, dp, make_convex=True) >
-                             margin * self.h_sfp(make_convex=True))
-        return np.logical_and(within_interval, within_separatrix)
+        try:
+            h_sfp_convex = self._h_sfp_convex
+        except AttributeError:
+            h_sfp_convex = self.h_sfp(make_convex=True)
+            self._h_sfp_convex = h_sfp_convex
+        z, dp = np.broadcast_arrays(z, dp)
+        # only evaluate the Hamiltonian within the bucket interval
+        within = np.asarray((self.z_left < z) & (z < self.z_right))
+        within[within] = (self.hamiltonian(z[within], dp[within],
+                                           make_convex=True, use_lut=use_lut)
+                          > margin * h_sfp_convex)
+        return within[()]
 
     def make_is_accepted(self, margin=0):
         """Return the function is_accepted(z, dp) definining the
@@ -674,9 +959,15 @@ class RFBucket(Printing):
         """
         return partial(self.is_in_separatrix, margin=margin)
 
-    def emittance_single_particle(self, z=None, sigma=2):
+    def emittance_single_particle(self, z=None, sigma=2, n_samples=4097):
         """The single particle emittance computed along a given
-        equihamiltonian line.
+        equihamiltonian line. For z=None this is the bucket area
+        enclosed by the separatrix.
+
+        As the area between the z axis and the equihamiltonian is a
+        one-dimensional integral along z, the equihamiltonian is
+        evaluated on n_samples uniformly spaced points at once and
+        integrated with the trapezoidal rule.
         """
         if z is not None:
             zl = -sigma * z
@@ -687,8 +978,8 @@ class RFBucket(Printing):
             zr = self.z_right
             f = self.separatrix
 
-        Q, error = dblquad(lambda y, x: 1, zl, zr,
-                           lambda x: 0, f)
+        z_samples = np.linspace(zl, zr, n_samples)
+        Q = trapezoid(f(z_samples), z_samples)
 
         return Q * 2*self.p0/np.abs(self.charge)
 
@@ -716,12 +1007,12 @@ class RFBucket(Printing):
         algorithms in the generators module.
         """
         # If Qs = 0, get the fundamental harmonic
-        hV = sum([h * V for h, V in zip(self.h, self.V)])
+        hV = self.h_arr.dot(self.V_arr)
         if hV == 0:
-            ix = np.argmax(self.V)
-            hV = self.h[ix] * self.V[ix]
-        Qs = np.sqrt(np.abs(self.charge)*np.abs(self.eta0)*hV /
-                     (2*np.pi*self.p0*self.beta*c))
+            ix = np.argmax(self.V_arr)
+            hV = self.h_arr[ix] * self.V_arr[ix]
+        Qs = np.sqrt(np.abs(self.charge)*np.abs(self._eta0)*hV /
+                     (2*np.pi*self._p0_beta_c))
         beta_z = np.abs(self.eta0 * self.R / Qs)
 
         # to be replaced with something more flexible (add_forces etc.)
@@ -79,7 +79,11 @@ cy_ext = [
               ["PyHEADTAIL/cobra_functions/interp_sin_cos.pyx"],
               include_dirs=[np.get_include()],
               library_dirs=[], libraries=["m"],
-              extra_compile_args=["-fopenmp"], extra_link_args=["-fopenmp"])
+              extra_compile_args=["-fopenmp"], extra_link_args=["-fopenmp"]),
+    Extension("PyHEADTAIL.trackers._bucket_fast",
+              ["PyHEADTAIL/trackers/_bucket_fast.pyx"],
+              include_dirs=[np.get_include()],
+              library_dirs=[], libraries=["m"])
 ]
 
 setup(